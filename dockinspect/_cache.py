@@ -0,0 +1,74 @@
+"""
+Persistent on-disk memoization of expensive computations keyed on their input files.
+
+Functions:
+    file_key: Builds a cache key component from a file path, modification time and size.
+    disk_memoize: Decorator that stores pickled function results in the DockInspect cache directory.
+"""
+
+import os
+import pickle
+import hashlib
+import functools
+
+CACHE_DIR = os.path.expanduser("~/.cache/dockinspect")
+# Part of every cache key; bump it whenever a memoized function changes its results
+CACHE_VERSION = 3
+
+def file_key(path: str) -> tuple:
+    """
+    Builds a cache key component that changes whenever the given file is modified.
+
+    :param path: Path to an input file.
+    :return: Tuple of the absolute path, nanosecond modification time and size of the file.
+    """
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+def _cache_file(func, key) -> str:
+    """
+    Builds the path of the cache entry of a function for a key.
+
+    :param func: Memoized function.
+    :param key: Result of the key function.
+    :return: Path to the pickle file under CACHE_DIR.
+    """
+    key = repr((CACHE_VERSION, func.__module__, func.__qualname__, key))
+    return os.path.join(CACHE_DIR, f"{hashlib.sha1(key.encode()).hexdigest()}.pkl")
+
+def disk_memoize(key_fn, rekey_after_call: bool = False):
+    """
+    Decorator that persists the results of a function as pickles under CACHE_DIR.
+
+    Entries are keyed on the function, CACHE_VERSION and the key_fn result. Missing or unreadable
+    cache entries are recomputed; failures to write the cache are ignored.
+
+    :param key_fn: Function receiving the decorated function's arguments and returning a hashable key.
+    :param rekey_after_call: If True, the result is stored under key_fn evaluated again after the call,
+                             for functions that create one of their keyed inputs (e.g. download a file).
+    :return: Decorator wrapping the function with the on-disk cache.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_file = _cache_file(func, key_fn(*args, **kwargs))
+            try:
+                with open(cache_file, "rb") as f:
+                    return pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+                pass
+
+            result = func(*args, **kwargs)
+            if rekey_after_call:
+                cache_file = _cache_file(func, key_fn(*args, **kwargs))
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+                with open(tmp_file, "wb") as f:
+                    pickle.dump(result, f)
+                os.replace(tmp_file, cache_file)
+            except OSError:
+                pass
+            return result
+        return wrapper
+    return decorator
@@ -10,10 +10,15 @@ Functions:
     export_hbond_residues: Saves pose hydrogen bond residue details
 """
 
+from __future__ import annotations
+
 import csv
-from dockinspect.ligand import Ligand
-from dockinspect.pockets import Pockets
-from dockinspect.poses import Poses
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from dockinspect.ligand import Ligand
+    from dockinspect.pockets import Pockets
+    from dockinspect.poses import Poses
 
 def export_ligand_info(ligand: Ligand, csv_path: str) -> None:
     """
@@ -23,15 +28,83 @@ def export_ligand_info(ligand: Ligand, csv_path: str) -> None:
     :param csv_path: Path to the output CSV file.
     :return: None
     """
-    with open(csv_path, "w", newline="") as f:
+    with open(csv_path, "w", buffering=1 << 20, newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["Property", "Value"])
-        writer.writerow(["SMILES", ligand.smiles])
-        writer.writerow(["logP", f"{ligand.logp:.2f}"])
-        writer.writerow(["SASA", f"{ligand.sasa:.2f}"])
-        writer.writerow(["TPSA", f"{ligand.tpsa:.2f}"])
-        writer.writerow(["Volume", f"{ligand.volume:.2f}"])
-        writer.writerow(["Charge", f"{ligand.charge}"])
+        writer.writerows([
+            ["SMILES", ligand.smiles],
+            ["logP", f"{ligand.logp:.2f}"],
+            ["SASA", f"{ligand.sasa:.2f}"],
+            ["TPSA", f"{ligand.tpsa:.2f}"],
+            ["Volume", f"{ligand.volume:.2f}"],
+            ["Charge", f"{ligand.charge}"]
+        ])
+
+def _write_batched(f, rows, batch_size: int = 1000) -> None:
+    """
+    Writes preformatted CSV lines to an open file in joined batches.
+
+    :param f: Open text file handle.
+    :param rows: Iterable of newline-terminated CSV lines.
+    :param batch_size: Number of lines joined into a single write call.
+    :return: None
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            f.write("".join(chunk))
+            chunk = []
+    if chunk:
+        f.write("".join(chunk))
+
+def _pocket_rows_iter(pockets: Pockets):
+    """
+    Yields one preformatted CSV line per pocket, sorted by pocket ID.
+
+    :param pockets: Pockets object.
+    :return: Generator of CSV lines.
+    """
+    for pid in pockets.sorted_pids:
+        pid, sasa, gravy, charge = pockets.pocket_row_fields(pid)
+        yield f"{pid},{sasa:.2f},{gravy:.2f},{charge}\r\n"
+
+def _poses_csv_body(poses: Poses) -> str:
+    """
+    Builds the CSV lines of all docking poses column by column with NumPy string operations.
+
+    :param poses: Poses object.
+    :return: CSV lines of all poses joined into one string.
+    """
+    import numpy as np
+
+    logp = f"{poses.ligand.logp:.2f}"
+    sasa_ligand = f"{poses.ligand.sasa:.2f}"
+    columns = [
+        np.arange(1, poses.number_of_models + 1).astype(str),
+        poses.pose_pocket_ids.astype(str),
+        poses.pose_hbond_counts.astype(str),
+        np.char.add(np.char.mod("%.2f", poses.pose_gravy), f"/{logp}"),
+        np.char.add(np.char.add(np.char.mod("%.2f", poses.pose_sasa_p), f"/{sasa_ligand}/"),
+                    np.char.mod("%.2f", poses.pose_sasa_r)),
+        np.char.add(poses.pose_charge_p.astype(str), f"/{poses.ligand.charge}")
+    ]
+    rows = columns[0]
+    for column in columns[1:]:
+        rows = np.char.add(np.char.add(rows, ","), column)
+    return "".join(np.char.add(rows, "\r\n").tolist())
+
+def _hbond_rows_iter(poses: Poses):
+    """
+    Yields one (pose number, residue) row per hydrogen-bonding residue.
+
+    :param poses: Poses object.
+    :return: Generator of CSV rows.
+    """
+    for i, hbonds_res in enumerate(poses.model_hbonds_res):
+        pose_number = i + 1
+        for res_str in hbonds_res:
+            yield (pose_number, res_str)
 
 def export_pocket_info(pockets: Pockets, csv_path: str) -> None:
     """
@@ -41,12 +114,9 @@ def export_pocket_info(pockets: Pockets, csv_path: str) -> None:
     :param csv_path: Path to the output CSV file.
     :return: None
     """
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Pocket_ID", "SASA", "GRAVY", "Charge"])
-        for pid in sorted(pockets.pocket_sasas.keys()):
-            row = pockets.format_pocket_row(pid).split()
-            writer.writerow(row)
+    with open(csv_path, "w", buffering=1 << 20, newline="") as f:
+        f.write("Pocket_ID,SASA,GRAVY,Charge\r\n")
+        _write_batched(f, _pocket_rows_iter(pockets))
 
 def export_poses_info(poses: Poses, csv_path: str) -> None:
     """
@@ -56,12 +126,8 @@ def export_poses_info(poses: Poses, csv_path: str) -> None:
     :param csv_path: Path to the output CSV file.
     :return: None
     """
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Pose", "Pocket", "HBonds", "GRAVY/LogP", "SASA(P/L/R)", "Charge(P/L)"])
-        for i in range(poses.number_of_models):
-            row = poses.format_pose_row(i).split()
-            writer.writerow(row)
+    with open(csv_path, "w", buffering=1 << 20, newline="") as f:
+        f.write("Pose,Pocket,HBonds,GRAVY/LogP,SASA(P/L/R),Charge(P/L)\r\n" + _poses_csv_body(poses))
 
 def export_hbond_residues(poses: Poses, csv_path: str) -> None:
     """
@@ -71,11 +137,7 @@ def export_hbond_residues(poses: Poses, csv_path: str) -> None:
     :param csv_path: Path to the output CSV file.
     :return: None
     """
-    with open(csv_path, "w", newline="") as f:
+    with open(csv_path, "w", buffering=1 << 20, newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["Pose", "Residue"])
-        for i, hbonds_res in enumerate(poses.model_hbonds_res):
-            pose_number = i + 1
-            for res in hbonds_res:
-                res_str = res if isinstance(res, str) else f"{res[1]}-{res[0]}{res[2]}"
-                writer.writerow([pose_number, res_str])
\ No newline at end of file
+        writer.writerows(_hbond_rows_iter(poses))
\ No newline at end of file
@@ -9,16 +9,48 @@ Functions:
     handle_visualization: Prepares visualization and pocket selection
 """
 
+from __future__ import annotations
+
 import os
+import sys
+import json
+import atexit
+import functools
 import subprocess
-from dockinspect.ligand import Ligand
-from dockinspect.pockets import Pockets
-from dockinspect.poses import Poses
 from dockinspect.export_info_to_csv import export_ligand_info, export_pocket_info, export_poses_info, export_hbond_residues
-from dockinspect.pymol_tools import get_pocket_residues_dict
-from dockinspect.my_csv_parser import get_df
+from dockinspect.pymol_tools import get_pocket_selections
+from dockinspect.my_csv_parser import parse_predictions
 from dockinspect.visualization import save_pml
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from dockinspect.ligand import Ligand
+    from dockinspect.pockets import Pockets
+    from dockinspect.poses import Poses
+
+_DEVNULL = open(os.devnull, "wb")
+atexit.register(_DEVNULL.close)
+
+@functools.lru_cache(maxsize=16)
+def _get_pocket_residues_dict_cached(predictions_file: str, mtime_ns: int) -> dict:
+    """
+    Parses a predictions file into PyMOL selections, cached on its path and st_mtime_ns.
+
+    :param predictions_file: Path to a CSV file containing pocket prediction results.
+    :param mtime_ns: Nanosecond modification time of the file, so the cache entry is dropped when it changes.
+    :return: Dictionary mapping pocket names to PyMOL residue selection strings.
+    """
+    return get_pocket_selections(parse_predictions(predictions_file))
+
+def _get_pocket_residues_dict(predictions_file: str) -> dict:
+    """
+    Returns the pocket-to-selection dictionary for a predictions file. The CSV is parsed again only
+    when its path or modification time changes.
+
+    :param predictions_file: Path to a CSV file containing pocket prediction results.
+    :return: Dictionary mapping pocket names to PyMOL residue selection strings.
+    """
+    return _get_pocket_residues_dict_cached(predictions_file, os.stat(predictions_file).st_mtime_ns)
 
 def handle_ligand_info(ligand: Ligand, csv: Optional[str] = None) -> None:
     """
@@ -54,8 +86,7 @@ def handle_pocket_info(pockets: Pockets, pocket_id: Optional[str] = None, csv: O
         else:
             print(pockets.format_pocket_row(pocket_id))
     else:
-        for pid in sorted(pockets.pocket_sasas.keys()):
-            print(pockets.format_pocket_row(pid))
+        sys.stdout.write("".join(f"{pockets.format_pocket_row(pid)}\n" for pid in pockets.sorted_pids))
 
     if csv:
         try:
@@ -78,15 +109,14 @@ def handle_poses_info(poses: Poses, pose_index: Optional[int] = None, csv: Optio
     header = f"{'Pose':<6} {'Pocket':<10} {'HBonds':<8} {'GRAVY/LogP':<15} {'SASA(P/L/R)':<25} {'Charge(P/L)':<15}"
 
     if show_res_only:
-        print("\nHydrogen-bonding residues per pose:\n")
+        lines = ["\nHydrogen-bonding residues per pose:\n"]
         for i, hbonds_res in enumerate(poses.model_hbonds_res):
             pose_label = f"Pose {i+1:>2}"
             if not hbonds_res:
-                print(f"{pose_label}: No hydrogen bonds.")
+                lines.append(f"{pose_label}: No hydrogen bonds.")
             else:
-                formatted_res = [res if isinstance(res, str) else f"{res[1]}-{res[0]}{res[2]}" for res in hbonds_res]
-                print(f"{pose_label}: {', '.join(formatted_res)}")
-        print()
+                lines.append(f"{pose_label}: {', '.join(hbonds_res)}")
+        sys.stdout.write("\n".join(lines) + "\n\n")
         return
 
     if pose_index is not None:
@@ -129,45 +159,22 @@ def launch_pymol_visualization(pdb_code: str, vina_file: str, distance: float =
     """
     script_path = os.path.join(os.path.dirname(__file__), "visualization_runtime.py")
     project_root = os.path.abspath(os.path.dirname(__file__))
-    fetched_filename = f"{pdb_code}.pdb" if not (pdb_code.endswith(".pdb") or pdb_code.endswith(".pdbqt")) else None
-
-    with open(script_path, "w") as f:
-        f.write(f"""from pymol import cmd
-import sys
-import os
-sys.path.insert(0, {repr(project_root)})
-
-from visualization import *
-
-visualize(
-    pdb_code={repr(pdb_code)},
-    vina_file={repr(vina_file)},
-    pocket_selection={repr(pocket_selection)},
-    pose_num={pose_num},
-    mode={repr(mode)},
-    distance={distance},
-    angle={angle}
-)
-""")
+    visualize_kwargs = json.dumps({
+        "pdb_code": pdb_code,
+        "vina_file": vina_file,
+        "pocket_selection": pocket_selection,
+        "pose_num": pose_num,
+        "mode": mode,
+        "distance": distance,
+        "angle": angle
+    })
 
     try:
         env = os.environ.copy()
         env["PYTHONPATH"] = project_root
-        subprocess.run(["pymol", script_path], cwd=project_root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,)
+        subprocess.run(["pymol", "-q", script_path, "--", visualize_kwargs], cwd=project_root, env=env, stdout=_DEVNULL, stderr=_DEVNULL)
     except Exception as e:
         print(f"Error running PyMOL: {e}")
-    finally:
-        try:
-            os.remove(script_path)
-        except OSError as cleanup_error:
-            print(f"Error removing temporary script: {cleanup_error}")
-        
-        if fetched_filename and os.path.exists(fetched_filename):
-            try:
-                os.remove(fetched_filename)
-                print(f"Deleted temporary fetched file {fetched_filename}")
-            except Exception as e:
-                print(f"Warning: Could not delete {fetched_filename}: {e}")
 
 def handle_visualization(pdb_code: str, vina_file: str, pose_num: int, mode: str, predictions_file: Optional[str] = None, 
                         poses: Optional[Poses] = None, distance: float = 3.2, angle: float = 25.0, save: Optional[str] = None, 
@@ -191,7 +198,7 @@ def handle_visualization(pdb_code: str, vina_file: str, pose_num: int, mode: str
     if poses and predictions_file:
         try:
             model_pockets = poses.model_pockets
-            pocket_residues_dict = get_pocket_residues_dict(get_df(predictions_file))
+            pocket_residues_dict = _get_pocket_residues_dict(predictions_file)
             pocket_id = model_pockets[pose_num - 1]
             pocket_selection = pocket_residues_dict.get(pocket_id, "")
         except Exception as e:
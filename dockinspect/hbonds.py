@@ -6,10 +6,28 @@ Functions:
     get_hydrogen_bonds_and_residues: Returns hydrogen bond atom pairs for each pose and residue names involved in hydrogen bonds per pose.
 """
 
+from dockinspect._cache import disk_memoize, file_key
+from dockinspect.visualization import cached_structure_file, load_structure
+
+def _structure_key(pdb_code: str) -> tuple:
+    """
+    Builds the cache key component of the structure that load_structure reads for a PDB code.
+
+    :param pdb_code: PDB code for the structure.
+    :return: file_key of the cached PDB file, or None if the structure is not cached yet.
+    """
+    structure_file = cached_structure_file(pdb_code)
+    return file_key(structure_file) if structure_file is not None else None
+
+@disk_memoize(lambda pdb_code, vina_file, distance, angle:
+              (pdb_code, _structure_key(pdb_code), file_key(vina_file), distance, angle),
+              rekey_after_call=True)
 def get_hydrogen_bonds_and_residues(pdb_code: str, vina_file: str, distance: float, angle: float) -> tuple:
     """
     Detects hydrogen bonds between protein and ligand for each pose, returning both
     atom index pairs and involved residue names.
+    Results are cached on disk per PDB code, locally cached structure file, Vina output file and cutoffs;
+    a structure fetched by this call is part of the key the result is stored under.
 
     :param pdb_code: PDB code for the structure to fetch.
     :param vina_file: Path to the PDBQT AutoDock Vina output file.
@@ -20,11 +38,11 @@ def get_hydrogen_bonds_and_residues(pdb_code: str, vina_file: str, distance: flo
              - List of involved residue names per pose.
     """
     import pymol
-    from pymol import cmd
+    from pymol import cmd, stored
 
     pymol.finish_launching(['pymol', '-qc'])
 
-    cmd.fetch(pdb_code, name="structure", type="pdb")
+    load_structure(cmd, pdb_code)
     cmd.load(vina_file, "out_vina")
     cmd.h_add()
 
@@ -33,26 +51,23 @@ def get_hydrogen_bonds_and_residues(pdb_code: str, vina_file: str, distance: flo
 
     n_states = cmd.count_states("out_vina")
 
-    for state in range(1, n_states + 1):
-        sel1 = 'structure and (donor or acceptor) and (elem N+O)'
-        sel2 = 'out_vina and (donor or acceptor) and (elem N+O)'
+    cmd.select("don_acc_prot", 'structure and (donor or acceptor) and (elem N+O)')
+    cmd.select("don_acc_lig", 'out_vina and (donor or acceptor) and (elem N+O)')
+
+    stored.resns = {}
+    cmd.iterate("structure", "stored.resns[index] = resn")
+    index_resn = stored.resns
 
-        hbonds = cmd.find_pairs(sel1, sel2, mode=1,
+    # States are searched serially: every cmd call takes PyMOL's global API lock, so
+    # find_pairs calls submitted from worker threads would not overlap.
+    for state in range(1, n_states + 1):
+        hbonds = cmd.find_pairs("don_acc_prot", "don_acc_lig", mode=1,
                                 cutoff=distance,
                                 angle=angle,
                                 state1=1, state2=state)
         model_hbonds.append(hbonds)
 
-        hbonds_res = []
-        for (m1, i1), (m2, i2) in hbonds:
-            if m1 == "structure":
-                res_info1 = cmd.get_model(f"{m1} and index {i1}").atom[0]
-                hbonds_res.append(res_info1.resn)
-            if m2 == "structure":
-                res_info2 = cmd.get_model(f"{m2} and index {i2}").atom[0]
-                hbonds_res.append(res_info2.resn)
-
-        model_hbonds_res.append(hbonds_res)
+        model_hbonds_res.append([index_resn[index] for pair in hbonds for model, index in pair if model == "structure"])
 
     cmd.quit()
     return model_hbonds, model_hbonds_res
\ No newline at end of file
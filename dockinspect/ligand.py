@@ -5,10 +5,32 @@ Classes:
     Ligand: Represents a small molecule with computed properties.
 """
 
+from functools import cached_property, lru_cache
 from rdkit import Chem
 from rdkit.Chem import Crippen, rdFreeSASA, AllChem
 from rdkit.Chem.rdMolDescriptors import DoubleCubicLatticeVolume
 
+@lru_cache(maxsize=128)
+def _compute_3d_props(smiles: str) -> tuple:
+    """
+    Embeds the ligand in 3D and computes the properties that depend on its coordinates,
+    memoized so repeated ligands are embedded only once.
+
+    :param smiles: Canonical SMILES string of the ligand.
+    :return: Tuple of (SASA, volume).
+    """
+    mol = Chem.AddHs(Chem.MolFromSmiles(smiles))
+    params = AllChem.ETKDGv3()
+    params.randomSeed = 0xC0FFEE
+    params.maxIterations = 20
+    params.useRandomCoords = True
+    if AllChem.EmbedMolecule(mol, params) == -1:
+        AllChem.EmbedMolecule(mol, useRandomCoords=True)
+
+    sasa = rdFreeSASA.CalcSASA(mol, rdFreeSASA.classifyAtoms(mol))
+    volume = DoubleCubicLatticeVolume(mol).GetVolume()
+    return sasa, volume
+
 class Ligand:
     """
     Represents a ligand and computes physicochemical properties from a SMILES string.
@@ -18,23 +40,34 @@ class Ligand:
     Attributes:
         smiles (str): The input SMILES string.
         logp (float): Calculated octanol-water partition coefficient (hydrophobicity).
-        sasa (float): Solvent accessible surface area (A^2).
+        sasa (float): Solvent accessible surface area (A^2), computed on first access.
         tpsa (float): Topological polar surface area (A^3).
-        volume (float): Molecular volume estimated using a lattice-based method (A^3).
+        volume (float): Molecular volume estimated using a lattice-based method (A^3), computed on first access.
         charge (int): Net formal charge of the molecule.
     """
     def __init__(self, smiles: str):
         self.smiles = smiles
-        mol = Chem.MolFromSmiles(smiles)
-        mol = Chem.AddHs(mol)
-        AllChem.EmbedMolecule(mol, AllChem.ETKDG())
+        self._canonical_smiles = Chem.MolToSmiles(Chem.MolFromSmiles(smiles))
+        mol = Chem.MolFromSmiles(self._canonical_smiles)
 
         self.logp = Crippen.MolLogP(mol)
-        self.sasa = rdFreeSASA.CalcSASA(mol, rdFreeSASA.classifyAtoms(mol))
         self.tpsa = Chem.rdMolDescriptors.CalcTPSA(mol)
-        self.volume = DoubleCubicLatticeVolume(mol).GetVolume()
         self.charge = sum([atom.GetFormalCharge() for atom in mol.GetAtoms()])
 
+    @cached_property
+    def sasa(self) -> float:
+        """
+        Solvent accessible surface area (A^2) of the embedded 3D ligand.
+        """
+        return _compute_3d_props(self._canonical_smiles)[0]
+
+    @cached_property
+    def volume(self) -> float:
+        """
+        Molecular volume (A^3) of the embedded 3D ligand.
+        """
+        return _compute_3d_props(self._canonical_smiles)[1]
+
     def __str__(self) -> str:
         """
         Returns a formatted string of ligand properties: LogP, SASA, TPSA, Volume, and Net Charge.
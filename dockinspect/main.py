@@ -17,12 +17,9 @@ Notes:
 
 import click
 import shlex
+import argparse
 import cmd as shell_cmd
-from dockinspect.ligand import Ligand
-from dockinspect.pockets import Pockets
-from dockinspect.poses import Poses
 from dockinspect.handlers import handle_ligand_info, handle_pocket_info, handle_poses_info, handle_visualization
-from dockinspect.hbonds import get_hydrogen_bonds_and_residues
 
 class Session:
     """
@@ -36,12 +33,17 @@ class Session:
     :param residues_file: Path to the CSV file mapping pockets to residues (optional).
     :param distance: Distance cutoff for hydrogen bond detection in Angstroms.
     :param angle: Angle cutoff for hydrogen bond detection in degrees.
-    :param model_hbonds: Precomputed hydrogen bonds model.
+    :param model_hbonds: Precomputed hydrogen bonds model (optional, detected on first use otherwise).
+    :param model_hbonds_res: Precomputed residues participating in hydrogen bonds per pose (optional).
     """
+    __slots__ = ("smiles", "_ligand", "pdb_code", "out_vina_file", "structure_file", "predictions_file",
+                 "residues_file", "pockets", "poses", "distance", "angle", "_hbonds", "_hbonds_res")
+
     def __init__(self, smiles: str = None, pdb_code: str = None, vina_file: str = None,
                  structure_file: str = None, predictions_file: str = None, residues_file: str = None,
-                 distance: float = 3.2, angle: float = 25.0, model_hbonds: list = None):
-        self.ligand = Ligand(smiles) if smiles else None
+                 distance: float = 3.2, angle: float = 25.0, model_hbonds: list = None, model_hbonds_res: list = None):
+        self.smiles = smiles
+        self._ligand = None
         self.pdb_code = pdb_code
         self.out_vina_file = vina_file
         self.structure_file = structure_file
@@ -51,7 +53,100 @@ class Session:
         self.poses = None 
         self.distance = distance
         self.angle = angle
-        self.hbonds = model_hbonds
+        self._hbonds = model_hbonds
+        self._hbonds_res = model_hbonds_res
+
+    @property
+    def ligand(self):
+        """
+        Ligand built from the session SMILES on first access, or None if no SMILES was given.
+        """
+        if self._ligand is None and self.smiles:
+            from dockinspect.ligand import Ligand
+            self._ligand = Ligand(self.smiles)
+        return self._ligand
+
+    def _detect_hbonds(self) -> None:
+        """
+        Runs the hydrogen bond detection for the session structure and poses if it has not been done yet.
+        """
+        if (self._hbonds is None or self._hbonds_res is None) and self.pdb_code and self.out_vina_file:
+            from dockinspect.hbonds import get_hydrogen_bonds_and_residues
+            self._hbonds, self._hbonds_res = get_hydrogen_bonds_and_residues(self.pdb_code, self.out_vina_file, self.distance, self.angle)
+
+    @property
+    def hbonds(self):
+        """
+        Hydrogen bond index pairs per pose, detected on first access.
+        """
+        if self._hbonds is None:
+            self._detect_hbonds()
+        return self._hbonds
+
+    @property
+    def hbonds_res(self):
+        """
+        Residues participating in hydrogen bonds per pose, detected on first access.
+        """
+        if self._hbonds_res is None:
+            self._detect_hbonds()
+        return self._hbonds_res
+
+class ShellArgumentParser(argparse.ArgumentParser):
+    """
+    Argument parser for shell commands that raises ValueError instead of exiting the shell on invalid input.
+    """
+    def error(self, message: str) -> None:
+        raise ValueError(message)
+
+_LIGAND_INFO_ARGUMENTS = (
+    ("--csv", {}),
+)
+_VISUALIZE_ARGUMENTS = (
+    ("--pose", {"type": int, "default": 1}),
+    ("--mode", {"default": ""}),
+    ("--save", {}),
+)
+_POCKET_INFO_ARGUMENTS = (
+    ("pocket_id", {"nargs": "?"}),
+    ("--csv", {}),
+)
+_POSES_INFO_ARGUMENTS = (
+    ("pose_index", {"nargs": "?", "type": int}),
+    ("--csv", {}),
+    ("--res", {"action": "store_true"}),
+    ("--csv_hbonds", {}),
+)
+SHELL_COMMAND_ARGUMENTS = {
+    "ligand_info": _LIGAND_INFO_ARGUMENTS,
+    "visualize": _VISUALIZE_ARGUMENTS,
+    "pocket_info": _POCKET_INFO_ARGUMENTS,
+    "poses_info": _POSES_INFO_ARGUMENTS
+}
+
+def _tokenize(line: str) -> list:
+    """
+    Splits a shell command line into tokens, using shlex only when quotes or escapes are present.
+
+    :param line: Argument string entered after the command name.
+    :return: List of argument tokens.
+    """
+    if '"' in line or "'" in line or "\\" in line:
+        return shlex.split(line)
+    return line.split()
+
+def _make_parser(prog: str, arguments: tuple) -> ShellArgumentParser:
+    """
+    Builds the argument parser of a shell command from its argument table.
+
+    :param prog: Name of the shell command.
+    :param arguments: Tuple of (argument name, add_argument keyword arguments) pairs.
+    :return: Parser for the shell command.
+    """
+    parser = ShellArgumentParser(prog=prog, add_help=False)
+    for name, options in arguments:
+        parser.add_argument(name, **options)
+    return parser
 
 class Shell(shell_cmd.Cmd):
     """
@@ -65,6 +160,24 @@ class Shell(shell_cmd.Cmd):
     def __init__(self, session: Session):
         super().__init__()
         self.session = session
+        self._parsers = {command: _make_parser(command, arguments) for command, arguments in SHELL_COMMAND_ARGUMENTS.items()}
+
+    def _parse(self, command: str, line: str):
+        """
+        Parses the arguments of a shell command with its prebuilt parser.
+
+        :param command: Name of the shell command.
+        :param line: Argument string entered after the command name.
+        :return: Parsed arguments namespace, or None if the arguments are invalid.
+        """
+        try:
+            args, unknown = self._parsers[command].parse_known_args(_tokenize(line or ""))
+        except ValueError as e:
+            print(f"Invalid arguments: {e}")
+            return None
+        for token in unknown:
+            print(f"Ignoring unrecognized argument: {token}")
+        return args
 
     def do_ligand_info(self, line=None) -> None:
         """
@@ -79,41 +192,27 @@ class Shell(shell_cmd.Cmd):
             print("No ligand loaded.")
             return
 
-        tokens = shlex.split(line or "")
-        csv = tokens[tokens.index("--csv") + 1] if "--csv" in tokens else None
-        handle_ligand_info(self.session.ligand, csv)
+        args = self._parse("ligand_info", line)
+        if args is None:
+            return
+        handle_ligand_info(self.session.ligand, args.csv)
 
     def do_visualize(self, line=None) -> None:
         """
         Launches PyMOL visualization for the selected pose and mode.
 
         Usage:
-            visualize [--pose NUM] [--mode MODE] [--save]
+            visualize [--pose NUM] [--mode MODE] [--save FILE]
 
         :param line: Command-line string with optional arguments:
                      --pose (int): Pose number to visualize (default = 1).
                      --mode (str): Visualization mode, one of (surface, polar, charge, hbonds) (default hbonds).
-                     --save_pml FILE: Save visualization PyMOL script instead of launching PyMOL.
+                     --save FILE: Save visualization PyMOL script instead of launching PyMOL.
         """
-        pose_num = 1
-        mode = ""
-        save = None
-        tokens = shlex.split(line or "")
-
-        i = 0
-        while i < len(tokens):
-            if tokens[i] == "--pose" and i + 1 < len(tokens):
-                pose_num = int(tokens[i + 1])
-                i += 2  
-            elif tokens[i] == "--mode" and i + 1 < len(tokens):
-                mode = tokens[i + 1]
-                i += 2  
-            elif tokens[i] == "--save" and i + 1 < len(tokens):
-                save = tokens[i + 1]
-                i += 2  
-            else:
-                print(f"Ignoring unrecognized argument: {tokens[i]}")
-                i += 1
+        args = self._parse("visualize", line)
+        if args is None:
+            return
+        pose_num, mode, save = args.pose, args.mode, args.save
 
         valid_modes = {"surface", "polar", "charge", "hbonds", ""}
         if mode not in valid_modes:
@@ -141,15 +240,10 @@ class Shell(shell_cmd.Cmd):
             print("Pocket data not available.")
             return
 
-        tokens = shlex.split(line or "")
-        pocket_id = None
-        csv = None
-        if "--csv" in tokens:
-            idx = tokens.index("--csv")
-            if idx + 1 < len(tokens):
-                csv = tokens[idx + 1]
-        pocket_id = next((tok for tok in tokens if not tok.startswith("--")), None)
-        handle_pocket_info(self.session.pockets, pocket_id, csv)
+        args = self._parse("pocket_info", line)
+        if args is None:
+            return
+        handle_pocket_info(self.session.pockets, args.pocket_id, args.csv)
 
     def do_poses_info(self, line=None) -> None:
         """
@@ -162,35 +256,16 @@ class Shell(shell_cmd.Cmd):
         If --csv is given, all poses are saved to a CSV.
         If --res is given, only residue names from H-bonds are shown.
         If --csv_hbonds is given, hydrogen bond residues per pose are saved to a file.
-        If --distance or --angle are given, they override the default H-bond cutoff values.
         """
         if not self.session.poses:
             print("Poses data not available. Ensure all required inputs are loaded.")
             return
 
-        tokens = shlex.split(line or "")
-        pose_index = None
-        csv = None
-        csv_hbonds = None
-        show_res_only = "--res" in tokens
-
-        i = 0
-        while i < len(tokens):
-            if tokens[i] == "--csv" and i + 1 < len(tokens):
-                csv = tokens[i + 1]
-                i += 2
-            elif tokens[i] == "--csv_hbonds" and i + 1 < len(tokens):
-                csv_hbonds = tokens[i + 1]
-                i += 2
-            elif tokens[i] == "--res":
-                i += 1
-            else:
-                try:
-                    pose_index = int(tokens[i]) - 1
-                except ValueError:
-                    print(f"Ignoring unrecognized argument: {tokens[i]}")
-                i += 1
-        handle_poses_info(self.session.poses, pose_index, csv, show_res_only, csv_hbonds)
+        args = self._parse("poses_info", line)
+        if args is None:
+            return
+        pose_index = args.pose_index - 1 if args.pose_index is not None else None
+        handle_poses_info(self.session.poses, pose_index, args.csv, args.res, args.csv_hbonds)
     
     def do_exit(self, line=None) -> None:
         """
@@ -232,13 +307,15 @@ def launch_shell(ligand_smiles: str, pdb_code: str, vina_file: str, structure_fi
     :param angle: Angle cutoff for hydrogen bond detection in degrees (default: 25.0).
     :return: None
     """
-    model_hbonds, model_hbonds_res = get_hydrogen_bonds_and_residues(pdb_code, vina_file, distance, angle)
+    from dockinspect.pockets import Pockets
+    from dockinspect.poses import Poses
+
     session = Session(smiles=ligand_smiles, pdb_code=pdb_code, vina_file=vina_file, structure_file=structure_file, predictions_file=predictions_file, 
-                      residues_file=residues_file, distance=distance, angle=angle, model_hbonds=model_hbonds)
+                      residues_file=residues_file, distance=distance, angle=angle)
 
     if predictions_file and residues_file:
         try:
-            session.pockets = Pockets(structure_file, predictions_file, residues_file)
+            session.pockets = Pockets.build(structure_file, predictions_file, residues_file)
         except Exception as e:
             print(f"Warning: Failed to initialize pocket data: {e}")
     else:
@@ -247,7 +324,8 @@ def launch_shell(ligand_smiles: str, pdb_code: str, vina_file: str, structure_fi
     if session.ligand and session.pockets and vina_file and pdb_code and predictions_file:
         try:
             session.poses = Poses(ligand=session.ligand, pockets=session.pockets, pdb_code=session.pdb_code, vina_file=vina_file, 
-                                  predictions_file=predictions_file, distance=distance, angle=angle, model_hbonds_res=model_hbonds_res)
+                                  predictions_file=predictions_file, distance=distance, angle=angle, model_hbonds_res=session.hbonds_res,
+                                  structure_file=structure_file)
         except Exception as e:
             print(f"Warning: Failed to initialize poses: {e}")
 
@@ -272,6 +350,8 @@ def ligand_info(ligand_smiles: str, csv: str = None) -> None:
     :param csv: Optional path to save the output as a CSV file.
     :return: None
     """
+    from dockinspect.ligand import Ligand
+
     ligand = Ligand(ligand_smiles)
     handle_ligand_info(ligand, csv)
 
@@ -293,7 +373,9 @@ def pocket_info(structure_file: str, predictions_file: str, residues_file: str,
     :param csv: Optional path to save pocket info as a CSV file.
     :return: None
     """
-    pockets = Pockets(structure_file, predictions_file, residues_file)
+    from dockinspect.pockets import Pockets
+
+    pockets = Pockets.build(structure_file, predictions_file, residues_file)
     handle_pocket_info(pockets, pocket_id, csv)
 
 @cli.command(name="poses_info")
@@ -329,9 +411,13 @@ def poses_info(ligand_smiles: str, pdb_code: str, vina_file: str, structure_file
     :param angle: Angle cutoff for hydrogen bond detection in degrees (default: 25.0).
     :return: None
     """
+    from dockinspect.ligand import Ligand
+    from dockinspect.pockets import Pockets
+    from dockinspect.poses import Poses
+
     ligand = Ligand(ligand_smiles)
-    pockets = Pockets(structure_file, predictions_file, residues_file)
-    poses = Poses(ligand, pockets, pdb_code, vina_file, predictions_file, distance, angle)
+    pockets = Pockets.build(structure_file, predictions_file, residues_file)
+    poses = Poses(ligand, pockets, pdb_code, vina_file, predictions_file, distance, angle, structure_file=structure_file)
     handle_poses_info(poses, pose_index - 1 if pose_index else None, csv, res, csv_hbonds)
 
 @cli.command(name="visualize")
@@ -359,17 +445,23 @@ def visualize_command(pdb_code: str, vina_file: str, pose: int = 1, mode: str =
     :param angle: Angle cutoff for hydrogen bond detection in degrees (default: 25.0).
     :return: None
     """
+    from dockinspect.hbonds import get_hydrogen_bonds_and_residues
+
+    model_hbonds, model_hbonds_res = get_hydrogen_bonds_and_residues(pdb_code, vina_file, distance, angle)
+
     poses = None
     if predictions_file and residues_file:
         try:
+            from dockinspect.ligand import Ligand
+            from dockinspect.pockets import Pockets
+            from dockinspect.poses import Poses
+
             ligand = Ligand("C")
-            pockets = Pockets(vina_file, predictions_file, residues_file)
-            poses = Poses(ligand, pockets, pdb_code, vina_file, predictions_file, distance, angle)
+            pockets = Pockets.build(vina_file, predictions_file, residues_file)
+            poses = Poses(ligand, pockets, pdb_code, vina_file, predictions_file, distance, angle, model_hbonds_res=model_hbonds_res)
         except Exception as e:
             print(f"Warning: Could not load poses for pocket mapping: {e}")
 
-    model_hbonds = get_hydrogen_bonds_and_residues(pdb_code, vina_file, distance, angle)[0]
-
     handle_visualization(
         pdb_code=pdb_code,
         vina_file=vina_file,
@@ -5,21 +5,45 @@ Functions:
     get_df: Reads a CSV file and returns a cleaned DataFrame.
     parse_predictions: Converts a prediction CSV to a pocket-to-residues dictionary.
     parse_residues: Converts a residue CSV to a residue-location-to-amino-acid dictionary.
+    get_pocket_arrays: Reads pocket names, centers and residue IDs of a prediction CSV into NumPy arrays.
 """
 
-import pandas as pd
+import csv
 
-def get_df(predictions_file: str) -> pd.DataFrame:
+def get_df(predictions_file: str, usecols: list = None, dtype=None) -> "pandas.DataFrame":
     """
     Parses a CSV file containing PDB predictions to generate an according dataframe.
+    Uses the C parser engine and skips the whitespace padding after delimiters.
 
     :param predictions_file: Path to the CSV file containing PDB predictions.
+    :param usecols: Optional list of column names (without surrounding whitespace) to read.
+    :param dtype: Optional dtype, or mapping of column names to dtypes, passed to pandas.
     :return: Dataframe from the given CSV file.
     """
-    df = pd.read_csv(predictions_file)
+    import pandas as pd
+
+    df = pd.read_csv(predictions_file, engine="c", skipinitialspace=True, dtype=dtype,
+                     usecols=(lambda column: column.strip() in usecols) if usecols else None)
     df.columns = df.columns.str.strip()
     return df
 
+def _read_rows(csv_file: str, columns: list):
+    """
+    Streams selected columns of a CSV file row by row with the standard csv module,
+    so only one row is held in memory at a time.
+
+    :param csv_file: Path to the CSV file.
+    :param columns: Column names (without surrounding whitespace) to read.
+    :return: Generator of rows, each a list of stripped string values in the order of columns.
+    """
+    with open(csv_file, newline="", buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader)]
+        indices = [header.index(column) for column in columns]
+        for row in reader:
+            if row:
+                yield [row[i].strip() for i in indices]
+
 def parse_predictions(predictions_file: str) -> dict:
     """
     Parses a CSV file containing predictions to generate a dictionary mapping pocket IDs 
@@ -28,16 +52,7 @@ def parse_predictions(predictions_file: str) -> dict:
     :param predictions_file: Path to the CSV file containing PDB predictions.
     :return: A dictionary where keys are pocket IDs and values are lists of residue IDs.
     """
-    
-    predictions_df = get_df(predictions_file)
-    pocket_locations_dict = {}
-
-    for index, row in predictions_df.iterrows():
-        pocket_name = row["name"].strip() 
-        residue_ids = row["residue_ids"].split()  
-        pocket_locations_dict[pocket_name] = residue_ids
-
-    return pocket_locations_dict
+    return {pocket_name: residue_ids.split() for pocket_name, residue_ids in _read_rows(predictions_file, ["name", "residue_ids"])}
 
 def parse_residues(residues_file: str) -> dict:
     """
@@ -47,15 +62,25 @@ def parse_residues(residues_file: str) -> dict:
     :param residues_file: Path to the CSV file containing PDB residue data.
     :return: A dictionary where keys are residue IDs and values are the three-letter amino acid abbreviations at those locations.
     """
+    rows = _read_rows(residues_file, ["chain", "residue_label", "residue_name"])
+    return {f"{chain}_{residue_id}": amino_acid for chain, residue_id, amino_acid in rows}
 
-    residues_df = get_df(residues_file)
-    location_aa_dict = {}
-
-    for _, row in residues_df.iterrows():
-        chain = row["chain"].strip()  
-        residue_id = row["residue_label"]  
-        amino_acid = row["residue_name"].strip()  
+def get_pocket_arrays(predictions_file: str) -> dict:
+    """
+    Parses a CSV file containing predictions into a dictionary of NumPy column arrays, without building a DataFrame.
 
-        location_aa_dict[f"{chain}_{residue_id}"] = amino_acid
+    :param predictions_file: Path to the CSV file containing PDB predictions.
+    :return: A dictionary with the "name" and "residue_ids" string arrays and, if the CSV has the center
+             columns, the "center_x", "center_y" and "center_z" float arrays, one entry per pocket.
+    """
+    import numpy as np
 
-    return location_aa_dict
\ No newline at end of file
+    columns = ["name", "residue_ids", "center_x", "center_y", "center_z"]
+    try:
+        rows = list(_read_rows(predictions_file, columns))
+    except ValueError:
+        columns = columns[:2]
+        rows = list(_read_rows(predictions_file, columns))
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    return {column: np.array(column_values, dtype=str if column in ("name", "residue_ids") else np.float64)
+            for column, column_values in zip(columns, values)}
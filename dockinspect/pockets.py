@@ -10,12 +10,42 @@ Classes:
     Pockets: Encapsulates methods and data for analyzing protein pocket properties.
 """
 
+import sys
 import freesasa
-from dockinspect.my_csv_parser import get_df, parse_predictions, parse_residues
-from dockinspect.pymol_tools import get_pocket_residues_dict
+import numpy as np
+from dockinspect.my_csv_parser import parse_predictions, parse_residues
+from dockinspect.pymol_tools import get_pocket_selections
+from dockinspect._cache import disk_memoize, file_key
 
 freesasa.setVerbosity(1)
 
+HYDROPHOBICITY_SCALE = {
+    "ALA": 1.8, "ARG": -4.5, "ASN": -3.5, "ASP": -3.5, "CYS": 2.5,
+    "GLN": -3.5, "GLU": -3.5, "GLY": -0.4, "HIS": -3.2, "ILE": 4.5,
+    "LEU": 3.8, "LYS": -3.9, "MET": 1.9, "PHE": 2.8, "PRO": -1.6,
+    "SER": -0.8, "THR": -0.7, "TRP": -0.9, "TYR": -1.3, "VAL": 4.2
+}
+POSITIVE_AAS = {"ARG", "LYS", "HIS"}
+NEGATIVE_AAS = {"ASP", "GLU"}
+
+AA_TO_IDX = {aa: i for i, aa in enumerate(HYDROPHOBICITY_SCALE)}
+UNKNOWN_AA_IDX = len(AA_TO_IDX)
+GRAVY_TABLE = np.array([*HYDROPHOBICITY_SCALE.values(), 0.0], dtype=np.float64)
+CHARGE_TABLE = np.array([1 if aa in POSITIVE_AAS else -1 if aa in NEGATIVE_AAS else 0
+                         for aa in HYDROPHOBICITY_SCALE] + [0], dtype=np.int64)
+
+def _pocket_totals(aa_codes: np.ndarray, pocket_codes: np.ndarray, pocket_lengths: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """
+    Sums a per amino acid table over the residues of each pocket with NumPy bincount.
+
+    :param aa_codes: Amino acid table index of each residue, grouped by pocket.
+    :param pocket_codes: Pocket index of each residue.
+    :param pocket_lengths: Number of residues of each pocket.
+    :param table: Value per amino acid table index.
+    :return: Array of per-pocket totals (float64).
+    """
+    return np.bincount(pocket_codes, weights=table[aa_codes], minlength=len(pocket_lengths))
+
 class Pockets:
     """
     Represents a collection of predicted protein pockets and calculates their physicochemical properties.
@@ -24,73 +54,97 @@ class Pockets:
         pocket_charges (dict): Net formal charge of each pocket.
         pocket_gravys (dict): GRAVY index (hydropathy) of each pocket.
         pocket_sasas (dict): Solvent-accessible surface area of each pocket.
+        sorted_pids (list): Pocket IDs with computed SASA, in sorted order.
     """
+    __slots__ = ("pocket_charges", "pocket_gravys", "pocket_sasas", "_sorted_pids")
+
+    _ROW_FMT = "{pid:<10} {sasa:>10.2f} {gravy:>10.2f} {charge:>10}".format_map
 
     @staticmethod
-    def get_pocket_charge(pocket_locations_dict: dict, location_aa_dict: dict) -> dict:
+    def get_pocket_residue_codes(pocket_locations_dict: dict, location_aa_dict: dict) -> tuple:
+        """
+        Flattens the residues of all pockets into amino acid table indices.
+
+        :param pocket_locations_dict: Dictionary where keys are pocket IDs and values are lists of chain and residue locations.
+        :param location_aa_dict: Dictionary mapping chain-residue locations to their corresponding amino acid abbreviations.
+        :return: Tuple of (amino acid index per residue, pocket index per residue, number of residues per pocket).
+        """
+        aa_codes = np.fromiter((AA_TO_IDX.get(location_aa_dict[location], UNKNOWN_AA_IDX)
+                                for locations in pocket_locations_dict.values() for location in locations), dtype=np.intp)
+        pocket_lengths = np.fromiter((len(locations) for locations in pocket_locations_dict.values()),
+                                     dtype=np.intp, count=len(pocket_locations_dict))
+        pocket_codes = np.repeat(np.arange(len(pocket_lengths)), pocket_lengths)
+        return aa_codes, pocket_codes, pocket_lengths
+
+    @staticmethod
+    def get_pocket_charge(pocket_locations_dict: dict, location_aa_dict: dict, residue_codes: tuple = None) -> dict:
         """
         Calculates the charge of each protein pocket based on the predicted amino acids.
 
         :param pocket_locations_dict: Dictionary where keys are pocket IDs and values are lists of chain and residue locations.
         :param location_aa_dict: Dictionary mapping chain-residue locations to their corresponding amino acid abbreviations.
+        :param residue_codes: Optional precomputed result of get_pocket_residue_codes for the same inputs.
         :return: Dictionary where keys are pocket IDs and values are the charge of the respective pockets.
         """
-        pocket_charge_dict = {}
-        for pocket in pocket_locations_dict:
-            pocket_charge_dict[pocket] = 0
-            locations = pocket_locations_dict[pocket]
-            for location in locations:
-                aa = location_aa_dict[location]
-                if aa in ["ARG", "LYS", "HIS"]:
-                    pocket_charge_dict[pocket] += 1
-                elif aa in ["ASP", "GLU"]: 
-                    pocket_charge_dict[pocket] -= 1
-        return pocket_charge_dict
+        aa_codes, pocket_codes, pocket_lengths = residue_codes or Pockets.get_pocket_residue_codes(pocket_locations_dict, location_aa_dict)
+        charges = _pocket_totals(aa_codes, pocket_codes, pocket_lengths, CHARGE_TABLE)
+        return dict(zip(pocket_locations_dict, charges.astype(np.int64).tolist()))
      
     @staticmethod
-    def get_pocket_gravy(pocket_locations_dict: dict, location_aa_dict: dict) -> dict:
+    def get_pocket_gravy(pocket_locations_dict: dict, location_aa_dict: dict, residue_codes: tuple = None) -> dict:
         """
         Calculates the GRAVY (grand average of hydropathy) of each protein pocket based on the predicted amino acids.
 
         :param pocket_locations_dict: Dictionary where keys are pocket IDs and values are lists of chain and residue locations.
         :param location_aa_dict: Dictionary mapping chain-residue locations to their corresponding amino acid abbreviations.
+        :param residue_codes: Optional precomputed result of get_pocket_residue_codes for the same inputs.
         :return: Dictionary where keys are pocket IDs and values are the average hydropathy of the respective pockets.
         """
-        hydrophobicity_scale = {
-            "ALA": 1.8, "ARG": -4.5, "ASN": -3.5, "ASP": -3.5, "CYS": 2.5,
-            "GLN": -3.5, "GLU": -3.5, "GLY": -0.4, "HIS": -3.2, "ILE": 4.5,
-            "LEU": 3.8, "LYS": -3.9, "MET": 1.9, "PHE": 2.8, "PRO": -1.6,
-            "SER": -0.8, "THR": -0.7, "TRP": -0.9, "TYR": -1.3, "VAL": 4.2
-        }
-
-        pocket_gravy_dict = {}
-        for pocket in pocket_locations_dict:
-            pocket_gravy_dict[pocket] = 0
-            locations = pocket_locations_dict[pocket]
-            for location in locations:
-                aa = location_aa_dict[location]
-                if aa:
-                    pocket_gravy_dict[pocket] += hydrophobicity_scale[aa]
-            pocket_gravy_dict[pocket] /= len(locations) if locations else 0
-            pocket_gravy_dict[pocket] = round(pocket_gravy_dict[pocket], 2)
-        return pocket_gravy_dict
+        aa_codes, pocket_codes, pocket_lengths = residue_codes or Pockets.get_pocket_residue_codes(pocket_locations_dict, location_aa_dict)
+        totals = _pocket_totals(aa_codes, pocket_codes, pocket_lengths, GRAVY_TABLE)
+        gravys = np.divide(totals, pocket_lengths, out=np.zeros(len(pocket_lengths)), where=pocket_lengths > 0)
+        return {pocket: round(gravy, 2) for pocket, gravy in zip(pocket_locations_dict, gravys.tolist())}
 
     @staticmethod
-    def get_pocket_sasas(predictions_file: str, structure_file: str) -> dict:
+    @disk_memoize(lambda pocket_locations_dict, structure_file:
+                  (tuple((pid, tuple(locations)) for pid, locations in pocket_locations_dict.items()), file_key(structure_file)))
+    def get_pocket_sasas(pocket_locations_dict: dict, structure_file: str) -> dict:
         """
         Calculates solvent accessible surface area (SASA) for each pocket using FreeSASA.
+        All distinct pocket selections are evaluated in a single selectArea call; pockets with identical
+        residue selections share one result. Pockets without any residue IDs have no selection and get SASA 0,
+        so every pocket of pocket_locations_dict is kept. Results are cached on disk until the pockets or the
+        structure file change.
 
-        :param predictions_file: Path to the CSV file containing pocket residue predictions.
+        :param pocket_locations_dict: Dictionary where keys are pocket IDs and values are lists of chain and residue locations.
         :param structure_file: Path to the structure file in PDBQT format.
         :return: Dictionary where keys are pocket IDs and values are their SASA values (A^2).
         """
-        pocket_data_df = get_df(predictions_file)
-        pocket_residues_dict = get_pocket_residues_dict(pocket_data_df)
-        commands =  [str(key) + ", " + str(value) for key, value in pocket_residues_dict.items()]
+        pocket_selections = get_pocket_selections(pocket_locations_dict)
+        selection_pids = {}
+        for pid, selection in pocket_selections.items():
+            selection_pids.setdefault(sys.intern(selection), pid)
+        commands = [f"{pid}, {selection}" for selection, pid in selection_pids.items()]
 
         structure = freesasa.Structure(structure_file)
         result = freesasa.calc(structure)
-        return freesasa.selectArea(commands, structure, result)
+        areas = freesasa.selectArea(commands, structure, result)
+        return {pid: areas[selection_pids[pocket_selections[pid]]] if pid in pocket_selections else 0.0
+                for pid in pocket_locations_dict}
+
+    @classmethod
+    @disk_memoize(lambda cls, structure_file, predictions_file, residues_file:
+                  (file_key(structure_file), file_key(predictions_file), file_key(residues_file)))
+    def build(cls, structure_file: str, predictions_file: str, residues_file: str) -> "Pockets":
+        """
+        Creates a Pockets object, reusing the on-disk cached result while the input files are unchanged.
+
+        :param structure_file: Path to the PDBQT structure file.
+        :param predictions_file: Path to the predicted pocket CSV file.
+        :param residues_file: Path to the residues CSV file.
+        :return: Pockets object for the given input files.
+        """
+        return cls(structure_file, predictions_file, residues_file)
 
     def __init__(self, structure_file: str, predictions_file: str, residues_file: str) -> None:
         """
@@ -103,10 +157,35 @@ class Pockets:
         pocket_locations_dict = parse_predictions(predictions_file)
         location_aa_dict = parse_residues(residues_file)
         
-        self.pocket_charges = Pockets.get_pocket_charge(pocket_locations_dict, location_aa_dict)
-        self.pocket_gravys = Pockets.get_pocket_gravy(pocket_locations_dict, location_aa_dict)
-        self.pocket_sasas = Pockets.get_pocket_sasas(predictions_file, structure_file)
+        residue_codes = Pockets.get_pocket_residue_codes(pocket_locations_dict, location_aa_dict)
+        
+        self.pocket_charges = Pockets.get_pocket_charge(pocket_locations_dict, location_aa_dict, residue_codes)
+        self.pocket_gravys = Pockets.get_pocket_gravy(pocket_locations_dict, location_aa_dict, residue_codes)
+        self.pocket_sasas = Pockets.get_pocket_sasas(pocket_locations_dict, structure_file)
     
+    @property
+    def sorted_pids(self) -> list:
+        """
+        Pocket IDs, sorted once and reused by the display and export paths.
+        Charge, GRAVY and SASA are all computed for the same pockets, so the keys of any of them suffice.
+
+        :return: Sorted list of pocket IDs.
+        """
+        try:
+            return self._sorted_pids
+        except AttributeError:
+            self._sorted_pids = sorted(self.pocket_sasas)
+            return self._sorted_pids
+
+    def pocket_row_fields(self, pid: str) -> tuple:
+        """
+        Collects the raw values of a single row of pocket data.
+
+        :param pid: Pocket ID.
+        :return: Tuple of (pocket ID, SASA, GRAVY, charge) for the given pocket.
+        """
+        return (pid, self.pocket_sasas[pid], self.pocket_gravys[pid], self.pocket_charges[pid])
+
     def format_pocket_row(self, pid: str) -> str:
         """
         Formats a single row of pocket data for printing.
@@ -114,25 +193,27 @@ class Pockets:
         :param pid: Pocket ID.
         :return: Formatted string with SASA, GRAVY and charge values for the given pocket.
         """
-        sasa = self.pocket_sasas.get(pid, 0)
-        gravy = self.pocket_gravys.get(pid, 0)
-        charge = self.pocket_charges.get(pid, 0)
-        return f"{str(pid):<10} {sasa:>10.2f} {gravy:>10.2f} {charge:>10}"
+        return Pockets._ROW_FMT({"pid": pid, "sasa": self.pocket_sasas[pid],
+                                 "gravy": self.pocket_gravys[pid], "charge": self.pocket_charges[pid]})
 
-    def __str__(self) -> str:
+    def format(self, sort: bool = True) -> str:
         """
-        Returns a formatted string representation of all pocket properties (SASA, GRAVY, Charge).
+        Formats all pocket properties (SASA, GRAVY, Charge) as a table.
 
+        :param sort: If True, pockets are listed by sorted pocket ID, otherwise in the order of the predictions file.
         :return: Multiline string table of all pocket descriptors.
         """
-        pocket_ids = sorted(set(self.pocket_charges.keys()) |
-                            set(self.pocket_gravys.keys()) |
-                            set(self.pocket_sasas.keys()))
-
         lines = []
         lines.append(f"{'Pocket ID':<10} {'SASA (A^2)':>10} {'GRAVY':>10} {'Charge':>10}")
         lines.append("-" * 42)
 
-        for pid in pocket_ids:
-            lines.append(self.format_pocket_row(pid))
-        return "\n".join(lines)
\ No newline at end of file
+        lines.extend(map(self.format_pocket_row, self.sorted_pids if sort else self.pocket_sasas))
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        """
+        Returns a formatted string representation of all pocket properties (SASA, GRAVY, Charge).
+
+        :return: Multiline string table of all pocket descriptors, sorted by pocket ID.
+        """
+        return self.format()
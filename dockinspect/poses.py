@@ -10,24 +10,61 @@ Classes:
     Poses: Evaluates ligand-pocket interactions and formats pose-specific properties.
 """
 
-import re
+import os
+import mmap
+import functools
 import numpy as np
-from pandas import DataFrame
+from functools import cached_property
+from itertools import repeat
 from dockinspect.ligand import Ligand
 from dockinspect.pockets import Pockets
-from dockinspect.my_csv_parser import get_df
+from dockinspect.my_csv_parser import get_pocket_arrays
 from dockinspect.hbonds import get_hydrogen_bonds_and_residues
 
+# Below this many pockets the broadcast distance matrix is faster than building a k-d tree
+KDTREE_MIN_POCKETS = 1000
+
+@functools.lru_cache(maxsize=16)
+def _get_model_pocket_cached(predictions_file: str, vina_file: str, structure_file: str,
+                             predictions_mtime_ns: int, vina_mtime_ns: int, structure_mtime_ns: int) -> tuple:
+    """
+    Assigns the closest pocket to each pose, cached on the three file paths and their st_mtime_ns,
+    so the assignment is recomputed only when one of the files changes.
+
+    :param predictions_file: Path to CSV with pocket predictions.
+    :param vina_file: Path to Autodock Vina PDBQT output file.
+    :param structure_file: Structure file used to derive pocket centers if the CSV has none, or None.
+    :param predictions_mtime_ns: Nanosecond modification time of the predictions file.
+    :param vina_mtime_ns: Nanosecond modification time of the Vina output file.
+    :param structure_mtime_ns: Nanosecond modification time of the structure file, or None.
+    :return: Tuple of closest pockets per pose (a tuple so the cached result cannot be modified).
+    """
+    pocket_data = get_pocket_arrays(predictions_file)
+    if "center_x" not in pocket_data:
+        if structure_file is None:
+            raise ValueError(f"{predictions_file} has no pocket center columns and no structure file was given.")
+        pocket_data = Poses.get_pocket_centers(pocket_data, structure_file)
+    models_avg_coordinates = Poses.get_models_avg_coordinates(vina_file)
+    return tuple(Poses.get_model_pocket_helper(pocket_data, models_avg_coordinates))
+
 class Poses:
     """
     Represents a collection of docking poses and analyzes their interaction with protein pockets.
 
         ligand (Ligand): Ligand object.
         pockets (Pockets): Pockets object.
-        model_hbonds (list): List of hydrogen bond pairs per model.
+        model_hbonds_res (list): List of residue strings participating in H-bonds per model.
         model_pockets (list): List of closest pockets assigned to each model.
         number_of_models (int): Total number of docking poses (models).
+        pose_pocket_ids (np.ndarray): Assigned pocket ID per pose.
+        pose_hbond_counts (np.ndarray): Number of H-bonding residues per pose.
+        pose_gravy (np.ndarray): GRAVY of the assigned pocket per pose.
+        pose_sasa_p (np.ndarray): SASA of the assigned pocket per pose.
+        pose_sasa_r (np.ndarray): Ligand-to-pocket SASA ratio per pose.
+        pose_charge_p (np.ndarray): Charge of the assigned pocket per pose.
     """
+    _ROW_FMT = "{0:<6} {1!s:<10} {2:<8} {3:<15} {4:<25} {5:<15}".format
+
     @staticmethod
     def get_models_avg_coordinates(vina_file: str) -> list:
         """
@@ -37,64 +74,107 @@ class Poses:
         :return: List of average (x, y, z) coordinates for each pose.
         """
         models_avg_coordinates = []
-        current_coordinates = []
-        with open(vina_file, 'r') as file:
-            for line in file:
-                if line.startswith("MODEL"):
-                    if current_coordinates:
-                        models_avg_coordinates.append(np.mean(current_coordinates, axis=0))
-                        current_coordinates = []
-                elif line.startswith("HETATM"):
-                    parts = re.split(r'\s+', line.strip())
-                    x = float(parts[5])
-                    y = float(parts[6])
-                    z = float(parts[7])
-                    current_coordinates.append((x, y, z))
-            models_avg_coordinates.append(np.mean(current_coordinates, axis=0))
+        sum_x = sum_y = sum_z = 0.0
+        n_atoms = 0
+        with open(vina_file, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return models_avg_coordinates
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                for line in iter(mapped_file.readline, b""):
+                    if line.startswith(b"MODEL"):
+                        if n_atoms:
+                            models_avg_coordinates.append((sum_x / n_atoms, sum_y / n_atoms, sum_z / n_atoms))
+                            sum_x = sum_y = sum_z = 0.0
+                            n_atoms = 0
+                    elif line.startswith(b"HETATM"):
+                        # PDBQT atom records keep x, y and z in fixed columns 31-38, 39-46 and 47-54
+                        sum_x += float(line[30:38])
+                        sum_y += float(line[38:46])
+                        sum_z += float(line[46:54])
+                        n_atoms += 1
+        if n_atoms:
+            models_avg_coordinates.append((sum_x / n_atoms, sum_y / n_atoms, sum_z / n_atoms))
         return models_avg_coordinates
 
     @staticmethod
-    def get_model_pocket_helper(pocket_data_df: DataFrame, models_avg_coordinates: list) -> list:
+    def get_model_pocket_helper(pocket_data: dict, models_avg_coordinates: list) -> list:
         """
         Assigns the closest pocket to each ligand pose based on spatial proximity.
+        Uses a broadcast distance matrix, or a k-d tree over the pocket centers if SciPy is installed and there
+        are at least KDTREE_MIN_POCKETS pockets. The broadcast path assigns equidistant pockets to the first one
+        in the file; the k-d tree path may pick any of them.
 
-        :param pocket_data_df: DataFrame from pocket prediction CSV.
+        :param pocket_data: Pocket columns from get_pocket_arrays, or a DataFrame from the pocket prediction CSV.
         :param models_avg_coordinates: List of ligand center coordinates for each pose.
-        :return: List of closest pocket names for each model.
-        """
-        model_pocket = []
-        for avg_coordinates in models_avg_coordinates:
-            avg_x, avg_y, avg_z = avg_coordinates
-            min_distance = float('inf')
-
-            for _, row in pocket_data_df.iterrows():
-                pocket_name = row["name"].strip()
-                center_x = row["center_x"]
-                center_y = row["center_y"]
-                center_z = row["center_z"]
-                distance = np.sqrt((avg_x - center_x) ** 2 + (avg_y - center_y) ** 2 + (avg_z - center_z) ** 2)
-
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_pocket = pocket_name
-                
-            model_pocket.append(closest_pocket)
-        return model_pocket
+        :return: List of closest pocket names for each model (None for every model if there are no pockets).
+        """
+        avg_coordinates = np.asarray(models_avg_coordinates, dtype=np.float64).reshape(-1, 3)
+        if len(pocket_data["name"]) == 0:
+            return [None] * len(avg_coordinates)
+        centers = np.column_stack([np.asarray(pocket_data[column], dtype=np.float64)
+                                   for column in ("center_x", "center_y", "center_z")])
+        names = np.char.strip(np.asarray(pocket_data["name"], dtype=str))
+
+        if len(centers) >= KDTREE_MIN_POCKETS:
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError:
+                pass
+            else:
+                _, closest = cKDTree(centers).query(avg_coordinates, k=1, workers=-1)
+                return names[closest].tolist()
+
+        # sqrt is monotonic, so the argmin of the squared distance is the closest pocket
+        differences = avg_coordinates[:, None, :] - centers[None, :, :]
+        squared_distances = np.einsum("ijk,ijk->ij", differences, differences)
+        return names[squared_distances.argmin(axis=1)].tolist()
 
     @staticmethod
-    def get_model_pocket(predictions_file: str, vina_file: str) -> list:
+    def get_pocket_centers(pocket_data: dict, structure_file: str) -> dict:
+        """
+        Derives pocket centers as the mean coordinates of all structure atoms of the pocket residues,
+        for prediction files without center columns. Pockets without any matching atom are dropped.
+
+        :param pocket_data: Pocket columns from get_pocket_arrays with at least "name" and "residue_ids".
+        :param structure_file: Path to the PDB/PDBQT structure file the residue IDs refer to.
+        :return: Pocket columns "name", "center_x", "center_y" and "center_z".
+        """
+        import pandas as pd
+
+        atoms = []
+        with open(structure_file, 'r') as file:
+            for line in file:
+                if line.startswith(("ATOM", "HETATM")):
+                    atoms.append((f"{line[21]}_{line[22:27].strip()}",
+                                  float(line[30:38]), float(line[38:46]), float(line[46:54])))
+        atoms_df = pd.DataFrame(atoms, columns=["location", "x", "y", "z"])
+        residues_df = pd.DataFrame({"name": pocket_data["name"],
+                                    "location": np.char.split(np.asarray(pocket_data["residue_ids"], dtype=str))})
+        residues_df = residues_df.explode("location")
+
+        centers = (residues_df.merge(atoms_df, on="location")
+                   .groupby("name", sort=False, observed=True)[["x", "y", "z"]].mean())
+        names = [name for name in pocket_data["name"].tolist() if name in centers.index]
+        values = centers.loc[names].values
+        return {"name": np.array(names, dtype=str), "center_x": values[:, 0], "center_y": values[:, 1], "center_z": values[:, 2]}
+
+    @staticmethod
+    def get_model_pocket(predictions_file: str, vina_file: str, structure_file: str = None) -> list:
         """
         Wrapper for assigning closest pockets to each pose based on coordinates.
 
-        :param predictions_filepath: Path to CSV with pocket centers.
-        :param out_vina_filepath: Path to Autodock Vina PDBQT output file.
+        The assignment is recomputed only when one of the files changes.
+
+        :param predictions_file: Path to CSV with pocket centers.
+        :param vina_file: Path to Autodock Vina PDBQT output file.
+        :param structure_file: Optional structure file used to derive pocket centers if the CSV has no center columns.
         :return: List of closest pockets per pose.
         """
-        pocket_data_df = get_df(predictions_file)
-        models_avg_coordinates = Poses.get_models_avg_coordinates(vina_file)
-        return Poses.get_model_pocket_helper(pocket_data_df, models_avg_coordinates)
+        structure_mtime_ns = os.stat(structure_file).st_mtime_ns if structure_file else None
+        return list(_get_model_pocket_cached(predictions_file, vina_file, structure_file, os.stat(predictions_file).st_mtime_ns,
+                                             os.stat(vina_file).st_mtime_ns, structure_mtime_ns))
 
-    def __init__(self, ligand: Ligand, pockets: Pockets, pdb_code: str, vina_file: str, predictions_file: str, distance:float, angle:float, model_hbonds_res:list = None):
+    def __init__(self, ligand: Ligand, pockets: Pockets, pdb_code: str, vina_file: str, predictions_file: str, distance:float, angle:float, model_hbonds_res:list = None, structure_file: str = None):
         """
         Initializes a Poses object by associating each ligand pose with a pocket and computing H-bonds.
 
@@ -105,17 +185,88 @@ class Poses:
         :param predictions_file: Path to CSV file with pocket predictions.
         :param distance: Distance cutoff for H-bond detection.
         :param angle: Angle cutoff for H-bond detection.
-        :úaram model_hbonds_res: Precomputed list of residues participating in H-bonds.
+        :param model_hbonds_res: Precomputed list of residues participating in H-bonds.
+        :param structure_file: Optional structure file used to derive pocket centers if the predictions have none.
         """
         self.ligand = ligand
         self.pockets = pockets
         if model_hbonds_res is None:
-            self.model_hbonds_res = get_hydrogen_bonds_and_residues(pdb_code, vina_file, distance, angle)[1]
-        else:
-            self.model_hbonds_res = model_hbonds_res
-        self.model_pockets = Poses.get_model_pocket(predictions_file, vina_file)
+            _, model_hbonds_res = get_hydrogen_bonds_and_residues(pdb_code, vina_file, distance, angle)
+        self.model_pockets = Poses.get_model_pocket(predictions_file, vina_file, structure_file)
+        self.model_hbonds_res = [[res if isinstance(res, str) else f"{res[1]}-{res[0]}{res[2]}" for res in hbonds_res]
+                                 for hbonds_res in model_hbonds_res]
         self.number_of_models = len(self.model_pockets)
 
+    @cached_property
+    def pose_pocket_ids(self) -> np.ndarray:
+        """
+        :return: Array of the pocket ID assigned to each pose.
+        """
+        return np.asarray(self.model_pockets, dtype=object)
+
+    @cached_property
+    def pose_hbond_counts(self) -> np.ndarray:
+        """
+        :return: Array of H-bonding residue counts per pose.
+        """
+        return np.fromiter((len(hbonds_res) for hbonds_res in self.model_hbonds_res), dtype=np.int64)
+
+    @cached_property
+    def pose_gravy(self) -> np.ndarray:
+        """
+        :return: Array of the assigned pocket GRAVY per pose.
+        """
+        return np.array([self.pockets.pocket_gravys.get(pocket, 0) for pocket in self.model_pockets], dtype=np.float64)
+
+    @cached_property
+    def pose_sasa_p(self) -> np.ndarray:
+        """
+        :return: Array of the assigned pocket SASA per pose.
+        """
+        return np.array([self.pockets.pocket_sasas.get(pocket, 0) for pocket in self.model_pockets], dtype=np.float64)
+
+    @cached_property
+    def pose_sasa_r(self) -> np.ndarray:
+        """
+        :return: Array of ligand-to-pocket SASA ratios per pose (0 where the pocket SASA is 0).
+        """
+        sasa_p = self.pose_sasa_p
+        return np.divide(self.ligand.sasa, sasa_p, out=np.zeros_like(sasa_p), where=sasa_p != 0)
+
+    @cached_property
+    def pose_charge_p(self) -> np.ndarray:
+        """
+        :return: Array of the assigned pocket charge per pose.
+        """
+        return np.array([self.pockets.pocket_charges.get(pocket, 0) for pocket in self.model_pockets], dtype=np.int64)
+
+    def pose_row_fields(self, i: int) -> tuple:
+        """
+        Collects the raw values of a single row of pose-pair analysis data from the per-pose columns.
+
+        :param i: Index of the docking pose.
+        :return: Tuple of (pose number, pocket, H-bond count, pocket GRAVY, ligand logP, pocket SASA,
+                 ligand SASA, SASA ratio, pocket charge, ligand charge).
+        """
+        return (
+            i + 1, self.pose_pocket_ids[i], int(self.pose_hbond_counts[i]),
+            float(self.pose_gravy[i]), self.ligand.logp,
+            float(self.pose_sasa_p[i]), self.ligand.sasa, float(self.pose_sasa_r[i]),
+            int(self.pose_charge_p[i]), self.ligand.charge
+        )
+
+    @staticmethod
+    def _format_row(pose: int, pocket: str, hbonds_count: int, gravy: float, logp: float, sasa_pocket: float,
+                    sasa_ligand: float, sasa_ratio: float, charge_pocket: int, charge_ligand: int) -> str:
+        """
+        Formats the raw values of a single row of pose-pair analysis data.
+
+        :return: Formatted string of pose properties and interactions.
+        """
+        return Poses._ROW_FMT(pose, pocket, hbonds_count, "%.2f/%.2f" % (gravy, logp),
+                              "%.2f/%.2f/%.2f" % (sasa_pocket, sasa_ligand, sasa_ratio),
+                              "%s/%s" % (charge_pocket, charge_ligand))
+
     def format_pose_row(self, i: int) -> str:
         """
         Formats a single row of pose-pair analysis data.
@@ -123,21 +274,7 @@ class Poses:
         :param i: Index of the docking pose.
         :return: Formatted string of pose properties and interactions.
         """
-        pocket = self.model_pockets[i]
-        hbonds_count = len(self.model_hbonds_res[i])
-        gravy = self.pockets.pocket_gravys.get(pocket, 0)
-        sasa_pocket = self.pockets.pocket_sasas.get(pocket, 0)
-        sasa_ligand = self.ligand.sasa
-        sasa_ratio = sasa_ligand / sasa_pocket if sasa_pocket else 0
-        charge_pocket = self.pockets.pocket_charges.get(pocket, 0)
-        charge_ligand = self.ligand.charge
-
-        return (
-            f"{i + 1:<6} {pocket:<10} {hbonds_count:<8} "
-            f"{f'{gravy:.2f}/{self.ligand.logp:.2f}':<15} "
-            f"{f'{sasa_pocket:.2f}/{sasa_ligand:.2f}/{sasa_ratio:.2f}':<25} "
-            f"{f'{charge_pocket}/{charge_ligand}':<15}"
-        )
+        return Poses._format_row(*self.pose_row_fields(i))
 
     def __str__(self) -> str:
         """
@@ -146,8 +283,10 @@ class Poses:
         :return: Multiline string table of pose-level metrics.
         """
         header = f"{'Pose':<6} {'Pocket':<10} {'HBonds':<8} {'GRAVY(P)/LogP(L)':<15} {'SASA(P/L/R)':<25} {'Charge(P/L)':<15}"
-        lines = [header, "-" * len(header)]
 
-        for i in range(self.number_of_models):
-            lines.append(self.format_pose_row(i))
-        return "\n".join(lines)
\ No newline at end of file
+        n = self.number_of_models
+        rows = zip(range(1, n + 1), self.pose_pocket_ids.tolist(), self.pose_hbond_counts.tolist(),
+                   self.pose_gravy.tolist(), repeat(self.ligand.logp, n), self.pose_sasa_p.tolist(),
+                   repeat(self.ligand.sasa, n), self.pose_sasa_r.tolist(), self.pose_charge_p.tolist(),
+                   repeat(self.ligand.charge, n))
+        return "\n".join([header, "-" * len(header), *(Poses._format_row(*row) for row in rows)])
@@ -4,28 +4,60 @@ into PyMOL-friendly selection strings.
 
 Functions:
     get_pocket_residues_dict: Converts residue IDs into selection strings by pocket.
+    get_pocket_selections: Converts already parsed pocket residue IDs into selection strings by pocket.
 """
 
+from __future__ import annotations
+
 import re
-from pandas import DataFrame
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+_RESIDUE_ID_RE = re.compile(r'([A-Z])_(\d+)')
+
+def _residues_selection(residue_ids: str) -> str:
+    """
+    Converts a whitespace-separated residue ID string into a PyMOL selection string.
+
+    :param residue_ids: Residue IDs in the chain_residue format, e.g. "A_123 A_124".
+    :return: Residue selection string for PyMOL, or None if no residue ID was found.
+    """
+    matches = _RESIDUE_ID_RE.findall(residue_ids)
+    if not matches:
+        return None
+    chain_letter = matches[0][0]
+    joined_residues = "+".join(residue for _, residue in matches)
+    return f"chain {chain_letter} and resi {joined_residues}"
 
-def get_pocket_residues_dict(pocket_data_df: DataFrame) -> dict:
+def get_pocket_residues_dict(pocket_data: DataFrame) -> dict:
     """
     Generates a dictionary where keys are pocket names and values are residues joined in one string 
-    formatted for the pymol selection command.
+    formatted for the pymol selection command. Pockets without any residue IDs are skipped.
+
+    :param pocket_data: A dataframe generated from a CSV file containing PDB predictions,
+                        or the equivalent pocket columns from get_pocket_arrays.
+    :return: A dictionary where keys are pocket names and values are residue selection strings for PyMOL.
+    """
+    pocket_residues_dict = {}
+    for pocket_name, residue_ids in zip(pocket_data['name'], pocket_data['residue_ids']):
+        residues_selection = _residues_selection(str(residue_ids))
+        if residues_selection is not None:
+            pocket_residues_dict[str(pocket_name).strip()] = residues_selection
+    return pocket_residues_dict
+
+def get_pocket_selections(pocket_locations_dict: dict) -> dict:
+    """
+    Generates the same selection strings as get_pocket_residues_dict from the output of parse_predictions,
+    so callers that already parsed the predictions CSV do not need to read it again.
 
-    :param pocket_data_df: A dataframe generated from a CSV file containing PDB predictions.
+    :param pocket_locations_dict: Dictionary where keys are pocket IDs and values are lists of residue IDs.
     :return: A dictionary where keys are pocket names and values are residue selection strings for PyMOL.
     """
     pocket_residues_dict = {}
-    for _, row in pocket_data_df.iterrows():
-            pocket_name = row['name'].strip()
-            residue_ids = row['residue_ids']
-            matches = re.findall(r'([A-Z])_(\d+)', residue_ids)
-            if matches:
-                chain_letter = matches[0][0] 
-                residues = [residue for _, residue in matches]
-                joined_residues = "+".join(residues)
-            residues_selection = f"chain {chain_letter} and resi {joined_residues}"
+    for pocket_name, residue_ids in pocket_locations_dict.items():
+        residues_selection = _residues_selection(" ".join(residue_ids))
+        if residues_selection is not None:
             pocket_residues_dict[pocket_name] = residues_selection
-    return pocket_residues_dict
\ No newline at end of file
+    return pocket_residues_dict
@@ -5,13 +5,128 @@ This module provides tools to visualize protein–ligand interactions in PyMOL
 based on the output from AutoDock Vina. It supports direct visualization
 via PyMOL and also generates reusable PyMOL scripts.
 
+Classes:
+    ModeConfig: Display settings of a visualization mode.
+
 Functions:
+    cached_structure_file: Returns the path of a protein structure in the local PDB cache.
+    hbond_residues_selection: Builds one selection of all residues taking part in hydrogen bonds.
+    load_structure: Loads a protein structure into PyMOL from the local PDB cache or by fetching it.
     visualize: Launches PyMOL with the desired visualization.
     save_pml_script: Writes a PyMOL script instead of launching the program.
 """
 
 import os
-    
+from dataclasses import dataclass
+
+PDB_CACHE_DIR = os.path.expanduser("~/.cache/dockinspect/pdb")
+
+@dataclass(frozen=True)
+class ModeConfig:
+    """
+    Display settings of a visualization mode.
+
+    Attributes:
+        hbonds (bool): Whether to compute and display hydrogen bonds.
+        not_pocket_surface_transparency (float): Transparency for non-pocket surface.
+        pocket_surface_transparency (float): Transparency for pocket surface.
+        color_mode (str): Residue coloring scheme, a key of COLOR_GROUPS (broad, detailed) or "".
+        show_pocket_surface (bool): Show pocket surface.
+        show_ligand_surface (bool): Show ligand surface.
+        show_not_pocket_surface (bool): Show surface of non-pocket protein regions.
+        show_pocket_sticks (bool): Show pocket residues as sticks.
+        show_ligand_sticks (bool): Show ligand as sticks.
+        colors (tuple): (color, selection) pairs applied before the residue coloring.
+    """
+    hbonds: bool = False
+    not_pocket_surface_transparency: float = 0
+    pocket_surface_transparency: float = 0
+    color_mode: str = ""
+    show_pocket_surface: bool = False
+    show_ligand_surface: bool = False
+    show_not_pocket_surface: bool = False
+    show_pocket_sticks: bool = False
+    show_ligand_sticks: bool = False
+    colors: tuple = ()
+
+MODE_CONFIG = {
+    "surface": ModeConfig(show_pocket_surface=True, show_not_pocket_surface=True, show_ligand_surface=True,
+                          not_pocket_surface_transparency=0.8,
+                          colors=(("hotpink", "out_vina"), ("white", "pocket"), ("grey", "not_pocket"))),
+    "polar": ModeConfig(show_pocket_surface=True, show_not_pocket_surface=True, show_ligand_sticks=True,
+                        color_mode="broad", not_pocket_surface_transparency=0.8, colors=(("grey", "not_pocket"),)),
+    "charge": ModeConfig(show_pocket_surface=True, show_not_pocket_surface=True, show_ligand_sticks=True,
+                         color_mode="detailed", not_pocket_surface_transparency=0.8, colors=(("grey", "not_pocket"),)),
+    "hbonds": ModeConfig(hbonds=True, show_pocket_sticks=True, show_ligand_sticks=True)
+}
+SHOW_ACTIONS = (
+    ("show_pocket_surface", "surface", "pocket"),
+    ("show_not_pocket_surface", "surface", "not_pocket"),
+    ("show_ligand_surface", "surface", "out_vina"),
+    ("show_pocket_sticks", "sticks", "pocket"),
+    ("show_ligand_sticks", "sticks", "out_vina")
+)
+COLOR_GROUPS = {
+    "broad": (
+        ("hydrophobic", "ALA+VAL+LEU+ILE+MET+PHE+TRP+PRO+GLY", "yellow"),
+        ("hydrophilic", "SER+THR+ASN+GLN+TYR+CYS+HIS+ARG+LYS+ASP+GLU", "blue")
+    ),
+    "detailed": (
+        ("hydrophobic", "ALA+VAL+LEU+ILE+MET+PHE+TRP+PRO+GLY", "yellow"),
+        ("acidic", "ASP+GLU", "red"),
+        ("basic", "LYS+ARG+HIS", "blue"),
+        ("neutral", "SER+THR+ASN+GLN+TYR+CYS", "white")
+    )
+}
+POCKET_CUTOFF = 3.6
+
+def cached_structure_file(pdb_code: str) -> str:
+    """
+    Looks up a protein structure in the local PDB cache.
+
+    :param pdb_code: PDB code for the protein structure.
+    :return: Path to the cached PDB file, or None if the structure has not been fetched yet.
+    """
+    for filename in (f"{pdb_code}.pdb", f"{pdb_code.lower()}.pdb"):
+        cached_file = os.path.join(PDB_CACHE_DIR, filename)
+        if os.path.exists(cached_file):
+            return cached_file
+    return None
+
+def load_structure(cmd, pdb_code: str, name: str = "structure") -> None:
+    """
+    Loads a protein structure into PyMOL, fetching it from the PDB only if it is not cached yet.
+
+    :param cmd: PyMOL cmd module.
+    :param pdb_code: PDB code for the protein structure.
+    :param name: Name of the PyMOL object to load the structure into (default "structure").
+    :return: None
+    """
+    cached_file = cached_structure_file(pdb_code)
+    if cached_file is not None:
+        cmd.load(cached_file, name)
+        return
+
+    os.makedirs(PDB_CACHE_DIR, exist_ok=True)
+    cmd.set("fetch_path", PDB_CACHE_DIR)
+    cmd.fetch(pdb_code, name=name, type="pdb")
+
+def hbond_residues_selection(hbonds: list) -> str:
+    """
+    Builds one selection of all residues taking part in the given hydrogen bonds.
+
+    :param hbonds: List of ((model, index), (model, index)) atom pairs as returned by cmd.find_pairs.
+    :return: byres selection string of the bonded residues, or None if there are no hydrogen bonds.
+    """
+    model_indices = {}
+    for (m1, i1), (m2, i2) in hbonds:
+        model_indices.setdefault(m1, {})[i1] = None
+        model_indices.setdefault(m2, {})[i2] = None
+    if not model_indices:
+        return None
+    atoms = " or ".join(f"({model} and index {'+'.join(map(str, indices))})" for model, indices in model_indices.items())
+    return f"byres ({atoms})"
+
 def visualize(pdb_code: str, vina_file: str, pose_num: int = 1, pocket_selection: str = "", mode: str = "", distance: float = 3.2, angle: float = 25) -> None:
     """
     Launches PyMOL with a visualization script for binding poses from AutoDock Vina.
@@ -24,36 +139,15 @@ def visualize(pdb_code: str, vina_file: str, pose_num: int = 1, pocket_selection
     :param distance: Distance cutoff for hydrogen bond detection in A (default: 3.2).
     :param angle: Angle cutoff for hydrogen bond detection in degrees (default: 25).
     
-    Internal optional settings (hardcoded inside function):
-    - hbonds: Whether to compute and display hydrogen bonds.
-    - cutoff: Distance threshold for defining pocket if no selection is given (A).
-    - not_pocket_surface_transparency: Transparency for non-pocket surface.
-    - pocket_surface_transparency: Transparency for pocket surface.
-    - color_mode: Residue coloring scheme (broad, detailed, or "").
-    - show_pocket_surface: Show pocket surface.
-    - show_ligand_surface: Show ligand surface.
-    - show_not_pocket_surface: Show surface of non-pocket protein regions.
-    - show_pocket_sticks: Show pocket residues as sticks.
-    - show_ligand_sticks: Show ligand as sticks.
+    Mode-dependent display settings are taken from MODE_CONFIG (see ModeConfig). If no pocket selection
+    is given, the pocket is defined as the residues within POCKET_CUTOFF A of the ligand.
 
     :return: None
     """
-    hbonds = False
-    cutoff = 3.6
-    not_pocket_surface_transparency = 0
-    pocket_surface_transparency = 0
-    color_mode = ""
-    show_pocket_surface = False
-    show_ligand_surface = False 
-    show_not_pocket_surface = False
-    show_pocket_sticks = False
-    show_ligand_sticks = False
-
     from pymol import cmd 
-    if mode == "":
-        mode = "hbonds"
+    config = MODE_CONFIG.get(mode or "hbonds", ModeConfig())
 
-    cmd.fetch(pdb_code, name="structure", type="pdb")
+    load_structure(cmd, pdb_code)
 
     cmd.load(vina_file, "out_vina")
     cmd.frame(pose_num)
@@ -61,7 +155,7 @@ def visualize(pdb_code: str, vina_file: str, pose_num: int = 1, pocket_selection
     cmd.hide("everything", "all")
 
     if not pocket_selection:
-        pocket_selection = f"br. (structure within {cutoff} of out_vina)"
+        pocket_selection = f"br. (structure within {POCKET_CUTOFF} of out_vina)"
         cmd.select("pocket", pocket_selection)
     else:
         pocket_selection = "structure and " + pocket_selection
@@ -69,82 +163,33 @@ def visualize(pdb_code: str, vina_file: str, pose_num: int = 1, pocket_selection
 
     cmd.select("not_pocket", "not (pocket or out_vina)")
 
-    if mode == "surface":
-        show_pocket_surface = True
-        show_not_pocket_surface = True
-        show_ligand_surface = True
-        not_pocket_surface_transparency = 0.8
-        pocket_surface_transparency = 0
-        cmd.color("hotpink", "out_vina")
-        cmd.color("white", "pocket")
-        cmd.color("grey", "not_pocket")
-    elif mode == "polar":
-        show_pocket_surface = True
-        show_not_pocket_surface = True
-        show_ligand_sticks = True
-        color_mode = "broad"
-        not_pocket_surface_transparency = 0.8
-        pocket_surface_transparency = 0
-        cmd.color("grey", "not_pocket")
-    elif mode == "charge":
-        show_pocket_surface = True
-        show_not_pocket_surface = True
-        show_ligand_sticks = True
-        color_mode = "detailed"
-        not_pocket_surface_transparency = 0.8
-        pocket_surface_transparency = 0
-        cmd.color("grey", "not_pocket")
-    elif mode == "hbonds":
-        hbonds = True
-        show_pocket_sticks = True
-        show_ligand_sticks = True
-
-    cmd.set("transparency", pocket_surface_transparency, "pocket")
-    cmd.set("transparency", not_pocket_surface_transparency, "not_pocket")
-
-    if show_pocket_surface:
-        cmd.show("surface", "pocket")
-    if show_not_pocket_surface:
-        cmd.show("surface", "not_pocket")
-    if show_ligand_surface:
-        cmd.show("surface", "out_vina")
-    if show_pocket_sticks:
-        cmd.show("sticks", "pocket")
-    if show_ligand_sticks:
-        cmd.show("sticks", "out_vina")
-
-    if hbonds:
+    for color, selection in config.colors:
+        cmd.color(color, selection)
+
+    cmd.set("transparency", config.pocket_surface_transparency, "pocket")
+    cmd.set("transparency", config.not_pocket_surface_transparency, "not_pocket")
+
+    for flag, representation, selection in SHOW_ACTIONS:
+        if getattr(config, flag):
+            cmd.show(representation, selection)
+
+    if config.hbonds:
         sel1 = 'structure and (donor or acceptor) and (elem N+O)'
         sel2 = 'out_vina and (donor or acceptor) and (elem N+O)'
         found_hbonds = cmd.find_pairs(sel1, sel2, mode=1, cutoff=distance, angle=angle, state1=1, state2=pose_num)
         for idx, ((m1, i1), (m2, i2)) in enumerate(found_hbonds):
             cmd.distance(f"hb_{idx}", f"{m1} and index {i1}", f"{m2} and index {i2}")
-            cmd.select(f"hb_res_{idx}_1", f"byres ({m1} and index {i1})")
-            cmd.select(f"hb_res_{idx}_2", f"byres ({m2} and index {i2})")
-            cmd.show("sticks", f"hb_res_{idx}_1 or hb_res_{idx}_2")
+        hb_res_selection = hbond_residues_selection(found_hbonds)
+        if hb_res_selection is not None:
+            cmd.select("hb_res", hb_res_selection)
+            cmd.show("sticks", "hb_res")
 
-    def color_regions(selection_name, resn, color):
+    for selection_name, resn, color in COLOR_GROUPS.get(config.color_mode, ()):
         cmd.select(selection_name, f'(pocket) and resn {resn}')
         cmd.color(color, selection_name)
-
-    if color_mode == "broad":
-        color_regions("hydrophobic", "ALA+VAL+LEU+ILE+MET+PHE+TRP+PRO+GLY", "yellow")
-        color_regions("hydrophilic", "SER+THR+ASN+GLN+TYR+CYS+HIS+ARG+LYS+ASP+GLU", "blue")
-    elif color_mode == "detailed":
-        color_regions("hydrophobic", "ALA+VAL+LEU+ILE+MET+PHE+TRP+PRO+GLY", "yellow")
-        color_regions("acidic", "ASP+GLU", "red")
-        color_regions("basic", "LYS+ARG+HIS", "blue")
-        color_regions("neutral", "SER+THR+ASN+GLN+TYR+CYS", "white")
     
     cmd.select("sele", "none")
 
-    fetched_filename = f"{pdb_code}.pdb"
-    if os.path.exists(fetched_filename):
-        try:
-            os.remove(fetched_filename)
-        except Exception as e:
-            print(f"Warning: could not remove {fetched_filename}: {e}")
-
 def save_pml(pdb_code: str, vina_file: str, pose_num: int = 1, pocket_selection: str = "", mode: str = "", model_hbonds = None, pml: str = "visualization.pml") -> None:
     """
     Writes a PyMOL visualization script (.pml) to file.
@@ -157,112 +202,55 @@ def save_pml(pdb_code: str, vina_file: str, pose_num: int = 1, pocket_selection:
     :param model_hbonds: Precomputed hydrogen bond data.
     :param pml: Path to save the generated .pml script (default: "visualization.pml").
 
-    Internal optional settings (hardcoded inside function):
-    - cutoff: Distance threshold for defining pocket if no selection is given (A).
-    - not_pocket_surface_transparency: Transparency for non-pocket surface.
-    - pocket_surface_transparency: Transparency for pocket surface.
-    - color_mode: Residue coloring scheme (broad, detailed, or "").
-    - show_pocket_surface: Show pocket surface.
-    - show_ligand_surface: Show ligand surface.
-    - show_not_pocket_surface: Show surface of non-pocket protein regions.
-    - show_pocket_sticks: Show pocket residues as sticks.
-    - show_ligand_sticks: Show ligand as sticks.
+    Mode-dependent display settings are taken from MODE_CONFIG (see ModeConfig). If no pocket selection
+    is given, the pocket is defined as the residues within POCKET_CUTOFF A of the ligand.
 
     :return: None
     """
-    cutoff = 3.6
-    not_pocket_surface_transparency = 0
-    pocket_surface_transparency = 0
-    color_mode = ""
-    show_pocket_surface = False
-    show_ligand_surface = False 
-    show_not_pocket_surface = False
-    show_pocket_sticks = False
-    show_ligand_sticks = False
-
-    if mode == "":
-        mode = "hbonds"
+    config = MODE_CONFIG.get(mode or "hbonds", ModeConfig())
+
+    lines = []
+    write = lines.append
+    write("reinitialize\n")
+    
+    write(f"fetch {pdb_code},name=structure, type=pdb, async=0\n")
+    write(f"load {vina_file}, out_vina\n")
+    write(f"frame {pose_num}\n")
+    write("h_add\n")
+    write("hide everything, all\n")
+
+    if not pocket_selection:
+        write(f"select pocket, br. (structure within {POCKET_CUTOFF} of out_vina)\n")
+    else:
+        write(f"select pocket, structure and ({pocket_selection})\n")
+    write("select not_pocket, not (pocket or out_vina)\n")
+
+    for color, selection in config.colors:
+        write(f"color {color}, {selection}\n")
+
+    write(f"set transparency, {config.pocket_surface_transparency}, pocket\n")
+    write(f"set transparency, {config.not_pocket_surface_transparency}, not_pocket\n")
+
+    for flag, representation, selection in SHOW_ACTIONS:
+        if getattr(config, flag):
+            write(f"show {representation}, {selection}\n")
+
+    if config.hbonds:
+        for idx, ((m1, i1), (m2, i2)) in enumerate(model_hbonds[pose_num-1]):
+            write(f"distance hb_{idx}, {m1} and index {i1}, {m2} and index {i2}\n")
+        hb_res_selection = hbond_residues_selection(model_hbonds[pose_num-1])
+        if hb_res_selection is not None:
+            write(f"select hb_res, {hb_res_selection}\n")
+            write("show sticks, hb_res\n")
+
+    for selection_name, resn, color in COLOR_GROUPS.get(config.color_mode, ()):
+        write(f"select {selection_name}, pocket and resn {resn}\n")
+        write(f"color {color}, {selection_name}\n")
+
+    write("select none\n")
+    write("zoom all\n")
 
     with open(pml, "w") as f:
-        write = f.write
-        write("reinitialize\n")
-        
-        write(f"fetch {pdb_code},name=structure, type=pdb, async=0\n")
-        write(f"load {vina_file}, out_vina\n")
-        write(f"frame {pose_num}\n")
-        write("h_add\n")
-        write("hide everything, all\n")
-
-        if not pocket_selection:
-            write(f"select pocket, br. (structure within {cutoff} of out_vina)\n")
-        else:
-            write(f"select pocket, structure and ({pocket_selection})\n")
-        write("select not_pocket, not (pocket or out_vina)\n")
-
-        if mode == "surface":
-            show_pocket_surface = True
-            show_not_pocket_surface = True
-            show_ligand_surface = True
-            not_pocket_surface_transparency = 0.8
-            pocket_surface_transparency = 0
-            write("color hotpink, out_vina\n")
-            write("color white, pocket\n")
-            write("color grey, not_pocket\n")
-        elif mode == "polar":
-            show_pocket_surface = True
-            show_not_pocket_surface = True
-            show_ligand_sticks = True
-            color_mode = "broad"
-            not_pocket_surface_transparency = 0.8
-            pocket_surface_transparency = 0
-            write("color grey, not_pocket\n")
-        elif mode == "charge":
-            show_pocket_surface = True
-            show_not_pocket_surface = True
-            show_ligand_sticks = True
-            color_mode = "detailed"
-            not_pocket_surface_transparency = 0.8
-            pocket_surface_transparency = 0
-            write("color grey, not_pocket\n")
-        elif mode == "hbonds":
-            show_pocket_sticks = True
-            show_ligand_sticks = True
-
-        write(f"set transparency, {pocket_surface_transparency}, pocket\n")
-        write(f"set transparency, {not_pocket_surface_transparency}, not_pocket\n")
-
-        if show_pocket_surface:
-            write("show surface, pocket\n")
-        if show_not_pocket_surface:
-            write("show surface, not_pocket\n")
-        if show_ligand_surface:
-            write("show surface, out_vina\n")
-        if show_pocket_sticks:
-            write("show sticks, pocket\n")
-        if show_ligand_sticks:
-            write("show sticks, out_vina\n")
-
-        if mode == "hbonds":
-            for idx, ((m1, i1), (m2, i2)) in enumerate(model_hbonds[pose_num-1]):
-                write(f"distance hb_{idx}, {m1} and index {i1}, {m2} and index {i2}\n")
-                write(f"select hb_res_{idx}_1, byres ({m1} and index {i1})\n")
-                write(f"select hb_res_{idx}_2, byres ({m2} and index {i2})\n")
-                write(f"show sticks, hb_res_{idx}_1 or hb_res_{idx}_2\n")
-
-        def __color_regions_save_pml(selection_name, resn, color):
-            write(f"select {selection_name}, pocket and resn {resn}\n")
-            write(f"color {color}, {selection_name}\n")
-
-        if color_mode == "broad":
-            __color_regions_save_pml("hydrophobic", "ALA+VAL+LEU+ILE+MET+PHE+TRP+PRO+GLY", "yellow")
-            __color_regions_save_pml("hydrophilic", "SER+THR+ASN+GLN+TYR+CYS+HIS+ARG+LYS+ASP+GLU", "blue")
-        elif color_mode == "detailed":
-            __color_regions_save_pml("hydrophobic", "ALA+VAL+LEU+ILE+MET+PHE+TRP+PRO+GLY", "yellow")
-            __color_regions_save_pml("acidic", "ASP+GLU", "red")
-            __color_regions_save_pml("basic", "LYS+ARG+HIS", "blue")
-            __color_regions_save_pml("neutral", "SER+THR+ASN+GLN+TYR+CYS", "white")
-
-        write("select none\n")
-        write("zoom all\n")
+        f.write("".join(lines))
 
     print(f"PML script saved to {pml}.")
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+PyMOL entry script used by launch_pymol_visualization.
+
+PyMOL runs this file directly; the keyword arguments for visualize are passed
+as a single JSON string after the "--" separator on the PyMOL command line.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from visualization import visualize
+
+visualize(**json.loads(sys.argv[-1]))
@@ -23,6 +23,9 @@ setup(
         "pymol>=3.0.0", # conda install -c conda-forge pymol-open-source
 
     ],
+    "kdtree": [
+        "scipy>=1.10",
+    ],
     },
     entry_points={
         'console_scripts': [
@@ -0,0 +1,22 @@
+import pytest
+from types import SimpleNamespace
+from dockinspect.pockets import Pockets
+from dockinspect.poses import Poses
+
+@pytest.fixture
+def mock_pockets():
+    pockets = Pockets.__new__(Pockets)
+    pockets.pocket_sasas = {"pocket2": 699.671, "pocket1": 1907.368}
+    pockets.pocket_gravys = {"pocket2": -2.51, "pocket1": 0.59}
+    pockets.pocket_charges = {"pocket2": 0, "pocket1": -1}
+    return pockets
+
+@pytest.fixture
+def mock_poses(mock_pockets):
+    poses = Poses.__new__(Poses)
+    poses.ligand = SimpleNamespace(logp=-0.98, sasa=96.49, charge=0)
+    poses.pockets = mock_pockets
+    poses.model_pockets = ["pocket1", "pocket2"]
+    poses.model_hbonds_res = [["ASP", "GLU"], []]
+    poses.number_of_models = 2
+    return poses
@@ -0,0 +1,44 @@
+import os
+import pytest
+from dockinspect import _cache
+from dockinspect._cache import disk_memoize, file_key
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+def test_disk_memoize_reuses_result_until_file_changes(tmp_path, cache_dir):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("1")
+    calls = []
+
+    @disk_memoize(lambda path: file_key(path))
+    def read_number(path):
+        calls.append(path)
+        return int(open(path).read())
+
+    assert read_number(str(input_file)) == 1
+    assert read_number(str(input_file)) == 1
+    assert len(calls) == 1
+
+    input_file.write_text("22")
+    os.utime(input_file, ns=(0, 10 ** 9))
+    assert read_number(str(input_file)) == 22
+    assert len(calls) == 2
+    assert len(list(cache_dir.iterdir())) == 2
+
+def test_disk_memoize_recomputes_after_version_change(tmp_path, cache_dir, monkeypatch):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("1")
+    calls = []
+
+    @disk_memoize(lambda path: file_key(path))
+    def read_number(path):
+        calls.append(path)
+        return int(open(path).read())
+
+    read_number(str(input_file))
+    monkeypatch.setattr(_cache, "CACHE_VERSION", _cache.CACHE_VERSION + 1)
+    read_number(str(input_file))
+    assert len(calls) == 2
@@ -1,6 +1,8 @@
 import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
 from click.testing import CliRunner
-from dockinspect.main import cli
+from dockinspect.main import cli, Shell, Session
 
 runner = CliRunner()
 
@@ -34,3 +36,26 @@ def test_visualize_command_missing_files():
     result = runner.invoke(cli, ["visualize", "missing", "missing.pdbqt"])
     assert result.exit_code != 0
     assert "Error" in result.output or "No such file" in result.output
+
+def test_shell_poses_info_parses_arguments():
+    """Test that shell poses_info arguments reach the handler parsed and converted to a 0-based index."""
+    session = SimpleNamespace(poses=object())
+    with patch("dockinspect.main.handle_poses_info") as handler:
+        Shell(session).onecmd("poses_info 3 --csv 'out file.csv' --res")
+    handler.assert_called_once_with(session.poses, 2, "out file.csv", True, None)
+
+def test_shell_pocket_info_parses_unquoted_arguments():
+    """Test that shell arguments without quotes are split on whitespace."""
+    session = SimpleNamespace(pockets=object())
+    with patch("dockinspect.main.handle_pocket_info") as handler:
+        Shell(session).onecmd("pocket_info  pocket1   --csv out.csv")
+    handler.assert_called_once_with(session.pockets, "pocket1", "out.csv")
+
+def test_session_detects_hbonds_lazily_once():
+    """Test that hydrogen bonds are only detected when first needed."""
+    with patch("dockinspect.hbonds.get_hydrogen_bonds_and_residues", return_value=([["pair"]], [["ASP"]])) as detect:
+        session = Session(pdb_code="2SRC", vina_file="out_vina.pdbqt")
+        detect.assert_not_called()
+        assert session.hbonds == [["pair"]]
+        assert session.hbonds_res == [["ASP"]]
+    detect.assert_called_once_with("2SRC", "out_vina.pdbqt", 3.2, 25.0)
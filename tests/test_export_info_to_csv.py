@@ -0,0 +1,41 @@
+import csv
+from dockinspect.export_info_to_csv import export_pocket_info, export_poses_info, export_hbond_residues
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+def test_export_pocket_info(tmp_path, mock_pockets):
+    csv_path = tmp_path / "pockets.csv"
+    export_pocket_info(mock_pockets, csv_path)
+    assert read_rows(csv_path) == [
+        ["Pocket_ID", "SASA", "GRAVY", "Charge"],
+        ["pocket1", "1907.37", "0.59", "-1"],
+        ["pocket2", "699.67", "-2.51", "0"]
+    ]
+
+def test_export_poses_info(tmp_path, mock_poses):
+    csv_path = tmp_path / "poses.csv"
+    export_poses_info(mock_poses, csv_path)
+    assert read_rows(csv_path) == [
+        ["Pose", "Pocket", "HBonds", "GRAVY/LogP", "SASA(P/L/R)", "Charge(P/L)"],
+        ["1", "pocket1", "2", "0.59/-0.98", "1907.37/96.49/0.05", "-1/0"],
+        ["2", "pocket2", "0", "-2.51/-0.98", "699.67/96.49/0.14", "0/0"]
+    ]
+
+def test_export_hbond_residues(tmp_path, mock_poses):
+    csv_path = tmp_path / "hbonds.csv"
+    export_hbond_residues(mock_poses, csv_path)
+    assert read_rows(csv_path) == [
+        ["Pose", "Residue"],
+        ["1", "ASP"],
+        ["1", "GLU"]
+    ]
+
+def test_export_poses_info_matches_pocket_sasa(tmp_path, mock_poses):
+    mock_poses.pockets.pocket_sasas["pocket1"] = 1907.365
+    pockets_path = tmp_path / "pockets.csv"
+    poses_path = tmp_path / "poses.csv"
+    export_pocket_info(mock_poses.pockets, pockets_path)
+    export_poses_info(mock_poses, poses_path)
+    assert read_rows(pockets_path)[1][1] == read_rows(poses_path)[1][4].split("/")[0] == "1907.37"
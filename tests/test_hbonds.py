@@ -0,0 +1,43 @@
+import os
+import sys
+from types import ModuleType, SimpleNamespace
+from dockinspect import _cache, hbonds, visualization
+
+class FakeCmd:
+    def __init__(self):
+        self.find_pairs_calls = 0
+        self.settings = {}
+
+    def set(self, name, value):
+        self.settings[name] = value
+
+    def fetch(self, pdb_code, name, type):
+        with open(os.path.join(self.settings["fetch_path"], f"{pdb_code.lower()}.pdb"), "w") as f:
+            f.write("ATOM\n")
+
+    def find_pairs(self, *args, **kwargs):
+        self.find_pairs_calls += 1
+        return []
+
+    def count_states(self, name):
+        return 1
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+def test_hbonds_are_cached_after_fetching_the_structure(tmp_path, monkeypatch):
+    monkeypatch.setattr(_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(visualization, "PDB_CACHE_DIR", str(tmp_path / "pdb"))
+    cmd = FakeCmd()
+    pymol = ModuleType("pymol")
+    pymol.cmd = cmd
+    pymol.stored = SimpleNamespace()
+    pymol.finish_launching = lambda args: None
+    monkeypatch.setitem(sys.modules, "pymol", pymol)
+    vina_file = tmp_path / "out_vina.pdbqt"
+    vina_file.write_text("MODEL 1\nENDMDL\n")
+
+    assert hbonds.get_hydrogen_bonds_and_residues("2SRC", str(vina_file), 3.2, 25.0) == ([[]], [[]])
+    assert hbonds.get_hydrogen_bonds_and_residues("2SRC", str(vina_file), 3.2, 25.0) == ([[]], [[]])
+    assert cmd.find_pairs_calls == 1
+    assert len(os.listdir(tmp_path / "cache")) == 1
@@ -0,0 +1,20 @@
+import pytest
+from dockinspect.ligand import Ligand, _compute_3d_props
+
+def test_equivalent_smiles_share_cached_properties():
+    _compute_3d_props.cache_clear()
+    ethanol = Ligand("CCO")
+    ethanol_reordered = Ligand("OCC")
+    assert (ethanol.logp, ethanol.sasa, ethanol.tpsa, ethanol.volume, ethanol.charge) == \
+           (ethanol_reordered.logp, ethanol_reordered.sasa, ethanol_reordered.tpsa,
+            ethanol_reordered.volume, ethanol_reordered.charge)
+    assert _compute_3d_props.cache_info().misses == 1
+    assert ethanol_reordered.smiles == "OCC"
+
+def test_topological_properties_skip_embedding():
+    _compute_3d_props.cache_clear()
+    ligand = Ligand("NC(=O)N")
+    assert round(ligand.logp, 2) == -0.98
+    assert round(ligand.tpsa, 2) == 69.11
+    assert ligand.charge == 0
+    assert _compute_3d_props.cache_info().currsize == 0
@@ -6,7 +6,7 @@ from io import StringIO
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dockinspect')))
-from my_csv_parser import get_df, parse_predictions, parse_residues
+from my_csv_parser import get_df, parse_predictions, parse_residues, get_pocket_arrays
 
 MOCK_PREDICTIONS = StringIO("""name,residue_ids
 pocket1,A_123 A_124 A_125
@@ -48,4 +48,22 @@ def test_parse_residues_manual(tmp_path):
         "B_201": "LYS"
     }
     result = parse_residues(mock_path)
-    assert result == expected
\ No newline at end of file
+    assert result == expected
+
+def test_get_df_accepts_dtype_mapping(tmp_path):
+    mock_path = tmp_path / "mock_preds.csv"
+    mock_path.write_text("name,rank\npocket1,1\n")
+
+    assert get_df(str(mock_path), dtype={"rank": str})["rank"].tolist() == ["1"]
+
+def test_get_pocket_arrays(tmp_path):
+    mock_path = tmp_path / "mock_preds.csv"
+    mock_path.write_text("  name , center_x, center_y, center_z, residue_ids\n"
+                         "pocket1 ,  1.5,  2.0, -3.0, A_123 A_124\n"
+                         "pocket2 , 10.0, 11.0, 12.0, B_200\n")
+
+    pocket_data = get_pocket_arrays(str(mock_path))
+    assert pocket_data["name"].tolist() == ["pocket1", "pocket2"]
+    assert pocket_data["center_x"].tolist() == [1.5, 10.0]
+    assert pocket_data["center_z"].tolist() == [-3.0, 12.0]
+    assert pocket_data["residue_ids"].tolist() == ["A_123 A_124", "B_200"]
@@ -36,4 +36,36 @@ def test_get_pocket_gravy(mock_pocket_locations, mock_location_aa):
         "pocket1": round((-4.5 + -0.4 + -3.5) / 3, 2),  # ARG, GLY, ASP
         "pocket2": round((-3.2 + -3.9) / 2, 2)          # HIS, LYS
     }
-    assert gravys == expected_gravys
\ No newline at end of file
+    assert gravys == expected_gravys
+
+def test_empty_pocket_has_neutral_charge_and_gravy(mock_location_aa):
+    pocket_locations = {"pocket1": ["A_123"], "empty": []}
+    assert Pockets.get_pocket_charge(pocket_locations, mock_location_aa) == {"pocket1": 1, "empty": 0}
+    assert Pockets.get_pocket_gravy(pocket_locations, mock_location_aa) == {"pocket1": -4.5, "empty": 0.0}
+
+def test_get_pocket_sasas_evaluates_duplicate_selections_once(tmp_path, monkeypatch):
+    from dockinspect import _cache
+    monkeypatch.setattr(_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    structure_file = tmp_path / "structure.pdbqt"
+    structure_file.write_text("")
+    pocket_locations = {"pocket1": ["A_1", "A_2"], "pocket2": ["A_1", "A_2"], "pocket3": ["B_5"], "empty": []}
+
+    with patch("pockets.freesasa") as mock_freesasa:
+        mock_freesasa.selectArea.side_effect = lambda commands, structure, result: {
+            command.split(",")[0]: float(i) for i, command in enumerate(commands)}
+        sasas = Pockets.get_pocket_sasas(pocket_locations, str(structure_file))
+
+    commands = mock_freesasa.selectArea.call_args[0][0]
+    assert commands == ["pocket1, chain A and resi 1+2", "pocket3, chain B and resi 5"]
+    assert sasas == {"pocket1": 0.0, "pocket2": 0.0, "pocket3": 1.0, "empty": 0.0}
+
+def test_format_orders_pockets():
+    pockets_obj = Pockets.__new__(Pockets)
+    pockets_obj.pocket_sasas = {"pocket2": 10.0, "pocket1": 20.0}
+    pockets_obj.pocket_gravys = {"pocket2": -1.0, "pocket1": 1.0}
+    pockets_obj.pocket_charges = {"pocket2": 0, "pocket1": 1}
+
+    sorted_ids = [line.split()[0] for line in str(pockets_obj).splitlines()[2:]]
+    file_order_ids = [line.split()[0] for line in pockets_obj.format(sort=False).splitlines()[2:]]
+    assert sorted_ids == ["pocket1", "pocket2"]
+    assert file_order_ids == ["pocket2", "pocket1"]
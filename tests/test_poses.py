@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+import pandas as pd
+from dockinspect import poses
+from dockinspect.poses import Poses
+
+def test_get_model_pocket_helper_assigns_closest_pocket():
+    pocket_data_df = pd.DataFrame({
+        "name": ["  pocket1", "  pocket2"],
+        "center_x": [0.0, 10.0],
+        "center_y": [0.0, 10.0],
+        "center_z": [0.0, 10.0]
+    })
+    models_avg_coordinates = [(1.0, 1.0, 1.0), (9.0, 8.0, 10.0), (5.0, 5.0, 5.0)]
+    assert Poses.get_model_pocket_helper(pocket_data_df, models_avg_coordinates) == ["pocket1", "pocket2", "pocket1"]
+
+def test_get_model_pocket_helper_kdtree_matches_broadcast(monkeypatch):
+    pytest.importorskip("scipy")
+    rng = np.random.default_rng(0)
+    pocket_data_df = pd.DataFrame(rng.uniform(-50, 50, (40, 3)), columns=["center_x", "center_y", "center_z"])
+    pocket_data_df.insert(0, "name", [f"pocket{i}" for i in range(40)])
+    models_avg_coordinates = list(rng.uniform(-50, 50, (25, 3)))
+
+    monkeypatch.setattr(poses, "KDTREE_MIN_POCKETS", 0)
+    tree_pockets = Poses.get_model_pocket_helper(pocket_data_df, models_avg_coordinates)
+    monkeypatch.setattr(poses, "KDTREE_MIN_POCKETS", len(pocket_data_df) + 1)
+    assert Poses.get_model_pocket_helper(pocket_data_df, models_avg_coordinates) == tree_pockets
+
+def test_get_models_avg_coordinates(tmp_path):
+    vina_file = tmp_path / "out_vina.pdbqt"
+    vina_file.write_text(
+        "MODEL 1\n"
+        "HETATM    1  N   UNL     1       3.739  21.671  68.277  1.00  0.00    -0.352 N \n"
+        "HETATM    2  C   UNL     1       4.814  21.317  67.549  1.00  0.00     0.311 C \n"
+        "ENDMDL\n"
+        "MODEL 2\n"
+        "HETATM    1  N   UNL     1     -10.000   0.500 100.000  1.00  0.00    -0.352 N \n"
+        "ENDMDL\n"
+    )
+    models_avg_coordinates = Poses.get_models_avg_coordinates(str(vina_file))
+    np.testing.assert_allclose(models_avg_coordinates, [[4.2765, 21.494, 67.913], [-10.0, 0.5, 100.0]])
+
+def test_str_rows_match_format_pose_row(mock_poses):
+    assert str(mock_poses).splitlines()[2:] == [mock_poses.format_pose_row(i) for i in range(2)]
+
+def test_get_models_avg_coordinates_empty_file(tmp_path):
+    vina_file = tmp_path / "empty.pdbqt"
+    vina_file.write_text("")
+    assert Poses.get_models_avg_coordinates(str(vina_file)) == []
+
+def test_get_model_pocket_helper_without_pockets():
+    pocket_data_df = pd.DataFrame({"name": [], "center_x": [], "center_y": [], "center_z": []})
+    assert Poses.get_model_pocket_helper(pocket_data_df, [(1.0, 1.0, 1.0), (2.0, 2.0, 2.0)]) == [None, None]
+
+def test_init_detects_hbonds_and_pockets(monkeypatch):
+    monkeypatch.setattr(poses, "get_hydrogen_bonds_and_residues", lambda *args: ([], [["ASP"], [("GLY", "A", 12)]]))
+    monkeypatch.setattr(Poses, "get_model_pocket", staticmethod(lambda predictions_file, vina_file, structure_file=None: ["pocket1", "pocket2"]))
+
+    poses_obj = Poses(None, None, "2SRC", "out_vina.pdbqt", "predictions.csv", 3.2, 25.0)
+    assert poses_obj.model_pockets == ["pocket1", "pocket2"]
+    assert poses_obj.model_hbonds_res == [["ASP"], ["A-GLY12"]]
+    assert poses_obj.number_of_models == 2
+
+def test_get_pocket_centers_from_structure(tmp_path):
+    structure_file = tmp_path / "structure.pdbqt"
+    structure_file.write_text(
+        "ATOM      1  N   ARG A 123       0.000   0.000   0.000  1.00  0.00    -0.352 N \n"
+        "ATOM      2  CA  ARG A 123       2.000   0.000   0.000  1.00  0.00     0.311 C \n"
+        "ATOM      3  CA  GLY A 124       4.000   3.000   0.000  1.00  0.00     0.311 C \n"
+        "ATOM      4  CA  HIS B 200      10.000  10.000  10.000  1.00  0.00     0.311 C \n"
+    )
+    pocket_data = {"name": np.array(["pocket1", "pocket2", "pocket3"]),
+                   "residue_ids": np.array(["A_123 A_124", "B_200", "C_1"])}
+
+    centers = Poses.get_pocket_centers(pocket_data, str(structure_file))
+    assert centers["name"].tolist() == ["pocket1", "pocket2"]
+    np.testing.assert_allclose(centers["center_x"], [2.0, 10.0])
+    np.testing.assert_allclose(centers["center_y"], [1.0, 10.0])
+    np.testing.assert_allclose(centers["center_z"], [0.0, 10.0])
+
+def test_pose_rows_print_pocket_sasa_like_pocket_rows(mock_poses):
+    mock_poses.pockets.pocket_sasas["pocket1"] = 1907.365
+    pocket_sasa = mock_poses.pockets.format_pocket_row("pocket1").split()[1]
+    assert pocket_sasa == "1907.37"
+    assert mock_poses.format_pose_row(0).split()[4].split("/")[0] == pocket_sasa
+    assert str(mock_poses).splitlines()[2].split()[4].split("/")[0] == pocket_sasa
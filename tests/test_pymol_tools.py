@@ -5,7 +5,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dockinspect')))
-from pymol_tools import get_pocket_residues_dict
+from pymol_tools import get_pocket_residues_dict, get_pocket_selections
 from my_csv_parser import get_df
 
 MOCK_PREDICTIONS_WITH_ATOMS = StringIO("""name,residue_ids,surf_atom_ids
@@ -23,4 +23,28 @@ def test_get_pocket_residues_dict_manual():
         "pocket1": "chain A and resi 123+124+125",
         "pocket2": "chain B and resi 200+201"
     }
-    assert result == expected
\ No newline at end of file
+    assert result == expected
+
+def test_get_pocket_selections_matches_dataframe_version():
+    MOCK_PREDICTIONS_WITH_ATOMS.seek(0)
+    df = pd.read_csv(MOCK_PREDICTIONS_WITH_ATOMS)
+
+    pocket_locations = {
+        "pocket1": ["A_123", "A_124", "A_125"],
+        "pocket2": ["B_200", "B_201"]
+    }
+    assert get_pocket_selections(pocket_locations) == get_pocket_residues_dict(df)
+
+def test_get_pocket_selections_skips_pockets_without_residues():
+    pocket_locations = {"pocket1": ["A_123"], "pocket2": []}
+    assert get_pocket_selections(pocket_locations) == {"pocket1": "chain A and resi 123"}
+
+def test_get_pocket_residues_dict_accepts_pocket_arrays(tmp_path):
+    from my_csv_parser import get_pocket_arrays
+    MOCK_PREDICTIONS_WITH_ATOMS.seek(0)
+    df = pd.read_csv(MOCK_PREDICTIONS_WITH_ATOMS)
+    df["center_x"] = df["center_y"] = df["center_z"] = 0.0
+    mock_path = tmp_path / "mock_preds.csv"
+    df.to_csv(mock_path, index=False)
+
+    assert get_pocket_residues_dict(get_pocket_arrays(str(mock_path))) == get_pocket_residues_dict(df)
@@ -0,0 +1,24 @@
+from dockinspect.visualization import save_pml
+
+def test_save_pml_surface_mode(tmp_path):
+    pml = tmp_path / "surface.pml"
+    save_pml("2SRC", "out_vina.pdbqt", pose_num=2, mode="surface", pml=str(pml))
+    lines = pml.read_text().splitlines()
+
+    assert "color hotpink, out_vina" in lines
+    assert "set transparency, 0.8, not_pocket" in lines
+    assert "show surface, out_vina" in lines
+    assert "show sticks, out_vina" not in lines
+
+def test_save_pml_hbonds_mode_writes_distances(tmp_path):
+    pml = tmp_path / "hbonds.pml"
+    model_hbonds = [[(("structure", 10), ("out_vina", 1)), (("structure", 12), ("out_vina", 1))]]
+    save_pml("2SRC", "out_vina.pdbqt", pocket_selection="chain A and resi 1+2", model_hbonds=model_hbonds, pml=str(pml))
+    lines = pml.read_text().splitlines()
+
+    assert "select pocket, structure and (chain A and resi 1+2)" in lines
+    assert "distance hb_0, structure and index 10, out_vina and index 1" in lines
+    assert "distance hb_1, structure and index 12, out_vina and index 1" in lines
+    assert "select hb_res, byres ((structure and index 10+12) or (out_vina and index 1))" in lines
+    assert [line for line in lines if line.startswith("select hb_res")] == [lines[lines.index("show sticks, hb_res") - 1]]
+    assert "show sticks, pocket" in lines